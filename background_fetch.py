@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+import utils
+import state
+import config
+
+class PrefetchWorker:
+    """
+    Periodically runs `git fetch --prune` for the active repository (and any
+    config.PREFETCH_WORKSPACE_REPOS) on a daemon thread, so remote-tracking refs
+    are already current when the user looks at them or pulls.
+    """
+    def __init__(self, interval=None):
+        self.interval = interval or config.PREFETCH_INTERVAL_SECONDS
+        self.last_fetch = {} # repo path -> (timestamp, return code)
+        self._network_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive(): return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="easygit-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set(); self._wake.set()
+
+    def request_fetch(self):
+        """Wakes the worker so it fetches now instead of at the next interval."""
+        self._wake.set()
+
+    def network_lock(self):
+        """Lock held while a background fetch runs; foreground push/pull take it to avoid ref-lock clashes."""
+        return self._network_lock
+
+    def _repositories(self):
+        repos = [state.current_repo_path] if state.current_repo_path else []
+        repos.extend(os.path.abspath(p) for p in config.PREFETCH_WORKSPACE_REPOS)
+        return [r for r in dict.fromkeys(repos) if utils.is_git_repository(r)]
+
+    def _run(self):
+        while not self._stop.is_set():
+            for repo_path in self._repositories():
+                if self._stop.is_set(): break
+                with self._network_lock:
+                    _, _, code = utils.run_command(
+                        ["git", "fetch", "--all", "--prune", "--quiet"], cwd=repo_path, capture_output=True, env=utils.NO_PROMPT_ENV
+                    )
+                self.last_fetch[repo_path] = (time.time(), code)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+worker = PrefetchWorker()
+
+def ahead_behind(repo_path):
+    """
+    Returns (ahead, behind) of HEAD relative to its upstream, computed from local
+    remote-tracking refs only (no network), or None if there is no upstream.
+    """
+    stdout, _, code = utils.run_command(
+        ["git", "rev-list", "--left-right", "--count", "HEAD...@{upstream}"], cwd=repo_path, capture_output=True
+    )
+    if code != 0 or not stdout: return None
+    try:
+        ahead, behind = stdout.split()
+        return int(ahead), int(behind)
+    except ValueError:
+        return None
+
+def remote_status_summary(repo_path):
+    """Short header text such as '↑1 ↓3, fetched 2m ago' for the local repo menu."""
+    counts = ahead_behind(repo_path)
+    parts = [f"↑{counts[0]} ↓{counts[1]}" if counts else "no upstream"]
+    fetched = worker.last_fetch.get(repo_path)
+    if fetched:
+        age = int(time.time() - fetched[0])
+        age_text = f"{age}s" if age < 60 else (f"{age // 60}m" if age < 3600 else f"{age // 3600}h")
+        parts.append(f"fetched {age_text} ago" if fetched[1] == 0 else "fetch failed")
+    return ", ".join(parts)
@@ -0,0 +1,76 @@
+import time
+import subprocess
+import utils
+import config
+
+BLAME_CACHE_NAME = "blame_cache"
+
+def iter_incremental_blame(repo_path, rel_path, commit):
+    """
+    Streams `git blame --incremental` for rel_path at commit. Yields
+    (first_line, line_count, sha, info) groups in the order git resolves them;
+    info holds author, date and summary (shared per commit).
+    """
+    process = subprocess.Popen(
+        ["git", "blame", "--incremental", commit, "--", rel_path],
+        cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    commits, current = {}, None
+    try:
+        for raw_line in process.stdout:
+            line = raw_line.decode('utf-8', errors='replace').rstrip("\n")
+            if current is None:
+                fields = line.split()
+                if len(fields) < 4: continue
+                sha = fields[0]
+                current = (int(fields[2]), int(fields[3]), sha)
+                commits.setdefault(sha, {"author": "", "date": "", "summary": ""})
+                continue
+            key, _, value = line.partition(" ")
+            info = commits[current[2]]
+            if key == "author": info["author"] = value
+            elif key == "author-time": info["date"] = value
+            elif key == "summary": info["summary"] = value
+            elif key == "filename": # Always the last header line of a group
+                yield current[0], current[1], current[2], info
+                current = None
+    finally:
+        if process.poll() is None: process.terminate()
+        process.stdout.close()
+        process.wait()
+
+def blob_lines(repo_path, rel_path, commit):
+    """Returns the file's lines at commit, or None if it does not exist there."""
+    result = subprocess.run(["git", "show", f"{commit}:{rel_path}"], cwd=repo_path, capture_output=True)
+    if result.returncode != 0: return None
+    return result.stdout.decode('utf-8', errors='replace').splitlines()
+
+def _cache_key(rel_path, commit):
+    return f"{commit}:{rel_path}"
+
+def load_cached(repo_path, rel_path, commit):
+    """Returns cached {'groups': [...], 'commits': {...}} for (file, commit), or None."""
+    return utils.load_json_cache(BLAME_CACHE_NAME).get(repo_path, {}).get(_cache_key(rel_path, commit))
+
+def store(repo_path, rel_path, commit, groups, commits):
+    cache = utils.load_json_cache(BLAME_CACHE_NAME)
+    repo_cache = cache.setdefault(repo_path, {})
+    repo_cache.pop(_cache_key(rel_path, commit), None)
+    repo_cache[_cache_key(rel_path, commit)] = {"groups": groups, "commits": commits}
+    while len(repo_cache) > config.BLAME_CACHE_MAX_FILES:
+        repo_cache.pop(next(iter(repo_cache)))
+    utils.save_json_cache(BLAME_CACHE_NAME, cache)
+
+def annotated_lines(file_lines, groups, commits):
+    """Yields 'sha author date | text' lines in file order from blame groups."""
+    owner = [None] * len(file_lines)
+    for first_line, count, sha in groups:
+        for n in range(first_line - 1, min(first_line - 1 + count, len(file_lines))):
+            owner[n] = sha
+    for n, text in enumerate(file_lines):
+        sha = owner[n]
+        info = commits.get(sha, {}) if sha else {}
+        yield f"{(sha or '')[:8]:<8} {info.get('author', '')[:16]:<16} {format_date(info.get('date', ''))} {n + 1:>5} | {text}"
+
+def format_date(epoch_text):
+    return time.strftime("%Y-%m-%d", time.localtime(int(epoch_text))) if epoch_text.isdigit() else " " * 10
@@ -7,6 +7,85 @@ DEFAULT_EDITOR = os.environ.get('EDITOR', 'nano' if platform.system() != 'Window
 # GitHub CLI command
 GH_COMMAND = "gh" # Make sure 'gh' is in your PATH
 
+# Directory where EasyGit keeps its caches and remembered settings
+EASYGIT_HOME = os.environ.get('EASYGIT_HOME', os.path.join(os.path.expanduser("~"), ".easygit"))
+
 # --- UI Configuration ---
 CLEAR_SCREEN_BETWEEN_MENUS = True
-CENTER_MENUS = True
\ No newline at end of file
+CENTER_MENUS = True
+# Pager used to stream long git output (diffs, logs); falls back to a built-in pager if not found.
+PAGER_COMMAND = os.environ.get('PAGER', 'less -R' if platform.system() != 'Windows' else '')
+
+# --- Pre-stage Scan Configuration ---
+PRESTAGE_SCAN_ENABLED = True
+LARGE_FILE_THRESHOLD_MB = 50 # Files at or above this size are flagged before staging
+BINARY_FILE_THRESHOLD_KB = 512 # Binary files at or above this size are flagged too
+BINARY_SNIFF_BYTES = 8000 # Same block size git itself inspects for NUL bytes
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+PRESTAGE_AUTO_ROUTE = None # None to ask, or "lfs" / "gitignore" to route flagged files automatically
+
+# --- Clone Configuration ---
+# Used when a repository has no remembered clone settings of its own.
+# "filter": None, "blob:none" (blobless) or "tree:0" (treeless); "depth": None for full history.
+DEFAULT_CLONE_OPTIONS = {"filter": None, "depth": None, "single_branch": False, "sparse_patterns": []}
+
+# --- Background Prefetch Configuration ---
+PREFETCH_ENABLED = True
+PREFETCH_INTERVAL_SECONDS = 300 # How often `git fetch --prune` runs in the background
+PREFETCH_WORKSPACE_REPOS = [] # Extra local repository paths to keep fetched besides the active one
+
+# --- Push Configuration ---
+PUSH_CONCURRENCY = 4 # Maximum number of remotes pushed to at the same time
+
+# --- History Configuration ---
+LOG_PAGE_SIZE = 40 # Commits shown per page in the log browser
+LOG_WRITE_COMMIT_GRAPH = True # Write a commit-graph (with changed-path filters) in the background if missing
+
+# --- Status Cache Configuration ---
+FS_WATCHER_ENABLED = True # Reuse `git status` results until the file system watcher sees a change
+WATCHER_ENABLE_GIT_STATUS_CACHES = False # Also turn on git's untracked cache / fsmonitor for watched repos
+
+# --- Repository Maintenance Configuration ---
+MAINTENANCE_TASKS = ["gc", "commit-graph"] # `git maintenance run --task=...` tasks
+MAINTENANCE_WRITE_MULTI_PACK_INDEX = True # Write a multi-pack-index so object lookups don't scan every pack
+MAINTENANCE_INDEX_VERSION_4 = True # Switch the index to version 4 (path-prefix compressed, smaller/faster to read)
+MAINTENANCE_MEASURE_RUNS = 3 # Timed runs per measurement; the median is reported
+
+# --- Mirror Sync Configuration ---
+MIRROR_ROOT = os.path.join(os.path.expanduser("~"), "easygit-mirrors") # Default directory for local mirrors
+MIRROR_SYNC_WORKERS = 4 # Repositories cloned/fetched at the same time
+
+# --- Remote Repository View Configuration ---
+REMOTE_VIEW_ENRICH = True # Fetch default branch, size, language, open PR/issue counts and archived flag via GraphQL
+REMOTE_METADATA_BATCH_SIZE = 25 # Repositories per GraphQL request (keeps each query well under GitHub's complexity limits)
+REMOTE_METADATA_WORKERS = 2 # GraphQL requests in flight at the same time
+
+# --- Search Configuration ---
+SEARCH_THREADS = os.cpu_count() or 4 # Threads for `git grep` and for scanning untracked files
+SEARCH_MAX_RESULTS = 200 # Search stops after this many matches
+
+# --- Pre-commit Check Configuration ---
+# Each check runs its command with batches of matching staged files appended, e.g.
+# {"name": "flake8", "command": ["flake8"], "patterns": ["*.py"]}
+PRECOMMIT_CHECKS = []
+PRECOMMIT_WORKERS = os.cpu_count() or 4 # Check processes run at the same time
+PRECOMMIT_BATCH_SIZE = 50 # Files passed to one check process
+
+# --- Branch / Worktree Configuration ---
+WORKTREE_ROOT = None # None keeps managed worktrees in '<repo>.worktrees' next to the main checkout
+WORKTREE_IDLE_DAYS = 14 # Clean managed worktrees unused for this long are removed automatically
+
+# --- Daemon Configuration ---
+DAEMON_SOCKET = os.path.join(EASYGIT_HOME, "daemon.sock") # Unix domain socket of the daemon started with `python daemon.py`
+DAEMON_CATALOG_TTL_SECONDS = 300 # How long the daemon serves the cached remote repository list
+USE_DAEMON_WHEN_RUNNING = True # Let the menus ask a running daemon instead of recomputing
+
+# --- Blame Configuration ---
+BLAME_CACHE_MAX_FILES = 200 # Blame results kept per repository (oldest dropped first)
+
+# --- Repository Statistics Configuration ---
+STATS_TOP_N = 15 # Contributors and hotspot files listed
+STATS_MONTHS = 12 # Most recent months shown in the per-author timeline
+
+# --- Submodule Configuration ---
+SUBMODULE_JOBS = min(8, (os.cpu_count() or 2) * 2) # Submodules fetched, checked and pushed at the same time
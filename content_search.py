@@ -0,0 +1,96 @@
+import os
+import re
+import queue
+import subprocess
+import threading
+import utils
+import config
+
+_DONE = object()
+
+class _GrepFailed:
+    def __init__(self, message):
+        self.message = message
+
+def _git_grep(repo_path, pattern, fixed, ignore_case, subdir, results, stop):
+    """
+    Streams matches in tracked files from `git grep`, which searches in parallel threads.
+    Regex mode uses -P (Perl-compatible), the same syntax Python's re applies to untracked files.
+    """
+    command = ["git", "grep", "-n", "-I", "-z", "--no-color", f"--threads={config.SEARCH_THREADS}"]
+    command.append("-F" if fixed else "-P")
+    if ignore_case: command.append("-i")
+    command.extend(["-e", pattern, "--"])
+    if subdir and subdir != ".": command.append(subdir)
+    try:
+        process = subprocess.Popen(command, cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        results.put(_DONE); return
+    try:
+        for raw_line in process.stdout:
+            if stop.is_set(): break
+            fields = raw_line.rstrip(b"\n").split(b"\0", 2)
+            if len(fields) != 3 or not fields[1].isdigit(): continue
+            results.put((os.fsdecode(fields[0]), int(fields[1]), fields[2].decode('utf-8', errors='replace')))
+    finally:
+        if process.poll() is None: process.terminate()
+        process.stdout.close()
+        error = process.stderr.read().decode('utf-8', errors='replace').strip()
+        process.stderr.close()
+        # 128 is a usage error, e.g. an invalid pattern or a git built without PCRE support.
+        if process.wait() == 128 and not stop.is_set(): results.put(_GrepFailed(error[len("fatal: "):] if error.startswith("fatal: ") else error))
+        results.put(_DONE)
+
+def _scan_files(repo_path, rel_paths, matcher, results, stop):
+    """Fallback scanner for a chunk of untracked files; skips binary files like git grep -I."""
+    for rel_path in rel_paths:
+        if stop.is_set(): break
+        try:
+            with open(os.path.join(repo_path, rel_path), 'rb') as f:
+                if b"\0" in f.read(config.BINARY_SNIFF_BYTES): continue
+                f.seek(0)
+                for line_no, raw_line in enumerate(f, 1):
+                    text = raw_line.decode('utf-8', errors='replace').rstrip("\r\n")
+                    if matcher.search(text):
+                        results.put((rel_path, line_no, text))
+                        if stop.is_set(): break
+        except OSError:
+            continue
+
+def _scan_untracked(repo_path, subdir, matcher, results, stop):
+    """Lists untracked files and scans them in parallel chunks, off the thread that starts git grep."""
+    try:
+        command = ["git", "ls-files", "-z", "--others", "--exclude-standard"]
+        if subdir and subdir != ".": command.extend(["--", subdir])
+        stdout, _, code = utils.run_command(command, cwd=repo_path, capture_output=True)
+        untracked = [p for p in stdout.split("\0") if p] if code == 0 and stdout and not stop.is_set() else []
+        chunk_count = min(config.SEARCH_THREADS, len(untracked))
+        scanners = [threading.Thread(target=_scan_files, args=(repo_path, untracked[i::chunk_count], matcher, results, stop), daemon=True)
+                    for i in range(chunk_count)]
+        for scanner in scanners: scanner.start()
+        for scanner in scanners: scanner.join()
+    finally:
+        results.put(_DONE)
+
+def search(repo_path, pattern, fixed=True, ignore_case=False, subdir=None, include_untracked=True):
+    """
+    Yields (rel_path, line_no, line_text) matches as soon as any producer finds them:
+    `git grep` for tracked files plus a parallel chunked scan of untracked files.
+    `git grep` starts first; untracked files are listed on their own thread so a
+    large untracked walk never delays tracked matches. Closing the generator stops all producers.
+    """
+    results, stop = queue.Queue(), threading.Event()
+    matcher = re.compile(re.escape(pattern) if fixed else pattern, re.IGNORECASE if ignore_case else 0) if include_untracked else None
+    producers = [threading.Thread(target=_git_grep, args=(repo_path, pattern, fixed, ignore_case, subdir, results, stop), daemon=True)]
+    if include_untracked:
+        producers.append(threading.Thread(target=_scan_untracked, args=(repo_path, subdir, matcher, results, stop), daemon=True))
+    for producer in producers: producer.start()
+    remaining = len(producers)
+    try:
+        while remaining:
+            item = results.get()
+            if item is _DONE: remaining -= 1
+            elif isinstance(item, _GrepFailed): raise re.error(item.message)
+            else: yield item
+    finally:
+        stop.set()
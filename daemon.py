@@ -0,0 +1,211 @@
+import os
+import json
+import errno
+import time
+import socket
+import threading
+import subprocess
+import socketserver
+import utils
+import config
+import fs_watcher
+import background_fetch
+import worktrees
+import history
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR, METHOD_NOT_FOUND, INVALID_PARAMS, SERVER_ERROR = -32700, -32601, -32602, -32000
+
+class _CatFileBatch:
+    """A long-lived `git cat-file --batch-check` process, so object lookups skip process startup."""
+    def __init__(self, repo_path):
+        self._lock = threading.Lock()
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch-check"], cwd=repo_path,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1
+        )
+
+    def lookup(self, rev):
+        with self._lock:
+            self._process.stdin.write(rev.replace("\n", " ") + "\n")
+            self._process.stdin.flush()
+            fields = self._process.stdout.readline().split()
+        if len(fields) == 3:
+            return {"object": fields[0], "type": fields[1], "size": int(fields[2])}
+        return None
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.wait()
+
+class DaemonState:
+    """Warm per-repository state shared by all requests."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._status_caches = {}
+        self._cat_files = {}
+        self._catalog = None
+        self._catalog_time = 0.0
+
+    def _repo(self, params):
+        repo_path = params.get("repo")
+        if not repo_path or not utils.is_git_repository(repo_path):
+            raise ValueError(f"Not a Git repository: {repo_path}")
+        return os.path.abspath(repo_path)
+
+    def status(self, params):
+        repo_path = self._repo(params)
+        with self._lock:
+            cache, repo_lock = self._status_caches.setdefault(repo_path, (fs_watcher.StatusCache(), threading.Lock()))
+        with repo_lock:
+            stdout, stderr, code = cache.status(repo_path, ["--porcelain"] if params.get("porcelain") else [])
+        return {"output": stdout, "error": stderr, "code": code}
+
+    def ahead_behind(self, params):
+        counts = background_fetch.ahead_behind(self._repo(params))
+        return {"ahead": counts[0], "behind": counts[1]} if counts else None
+
+    def branches(self, params):
+        return worktrees.list_branches(self._repo(params))
+
+    def log(self, params):
+        stream = history.CommitLogStream(self._repo(params), params.get("start_rev"), params.get("path"))
+        try:
+            skip, limit = int(params.get("skip", 0)), int(params.get("limit", config.LOG_PAGE_SIZE))
+            if skip: stream.next_page(skip)
+            return stream.next_page(limit)
+        finally:
+            stream.close()
+
+    def object_info(self, params):
+        repo_path = self._repo(params)
+        with self._lock:
+            batch = self._cat_files.get(repo_path) or self._cat_files.setdefault(repo_path, _CatFileBatch(repo_path))
+        return batch.lookup(params.get("rev", "HEAD"))
+
+    def fetch(self, params):
+        repo_path = self._repo(params)
+        with background_fetch.worker.network_lock():
+            _, stderr, code = utils.run_command(
+                ["git", "fetch", "--all", "--prune", "--quiet"], cwd=repo_path, capture_output=True, env=utils.NO_PROMPT_ENV
+            )
+        return {"code": code, "error": stderr}
+
+    def remote_repos(self, params):
+        """Cached `gh repo list`; refreshed after DAEMON_CATALOG_TTL_SECONDS or on request."""
+        with self._lock:
+            fresh = time.time() - self._catalog_time < config.DAEMON_CATALOG_TTL_SECONDS
+            if self._catalog is not None and fresh and not params.get("refresh"):
+                return self._catalog
+        stdout, stderr, code = utils.run_command(utils.gh_repo_list_command(), capture_output=True)
+        if code != 0: raise RuntimeError(stderr or "gh repo list failed")
+        catalog = json.loads(stdout or "[]")
+        with self._lock:
+            self._catalog, self._catalog_time = catalog, time.time()
+        return catalog
+
+    def close(self):
+        for batch in self._cat_files.values(): batch.close()
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            if not raw.strip(): continue
+            response = self.server.dispatch(raw)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+            self.wfile.flush()
+            if self.server.stop_requested: # Stop only after the 'shutdown' reply has been delivered
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+def _remove_stale_socket(socket_path):
+    """
+    Unlinks a socket left behind by a daemon that did not exit cleanly. Raises OSError
+    (EADDRINUSE) if another daemon still answers on it, so it is not orphaned.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(2.0)
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path); return
+    raise OSError(errno.EADDRINUSE, f"Another EasyGit daemon is already listening on {socket_path}")
+
+class EasyGitDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves EasyGit operations as newline-delimited JSON-RPC 2.0 over a Unix domain socket."""
+    daemon_threads = True
+
+    def __init__(self, socket_path=None):
+        self.socket_path = socket_path or config.DAEMON_SOCKET
+        self.stop_requested = False
+        self.state = DaemonState()
+        self.methods = {
+            "ping": lambda params: {"pid": os.getpid()},
+            "status": self.state.status,
+            "ahead_behind": self.state.ahead_behind,
+            "branches": self.state.branches,
+            "log": self.state.log,
+            "object_info": self.state.object_info,
+            "fetch": self.state.fetch,
+            "remote_repos": self.state.remote_repos,
+            "shutdown": self._shutdown,
+        }
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            _remove_stale_socket(self.socket_path)
+        old_umask = os.umask(0o177) # Socket is only accessible to the current user
+        try:
+            super().__init__(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def _shutdown(self, params):
+        self.stop_requested = True
+        return {"stopping": True}
+
+    def dispatch(self, raw):
+        try:
+            request = json.loads(raw)
+        except ValueError:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "Parse error"}}
+        request_id = request.get("id")
+        method = self.methods.get(request.get("method"))
+        if method is None:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": METHOD_NOT_FOUND, "message": f"Unknown method: {request.get('method')}"}}
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": INVALID_PARAMS, "message": "params must be an object"}}
+        try:
+            return {"jsonrpc": "2.0", "id": request_id, "result": method(params)}
+        except ValueError as e:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": INVALID_PARAMS, "message": str(e)}}
+        except Exception as e:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": SERVER_ERROR, "message": str(e)}}
+
+    def server_close(self):
+        super().server_close()
+        self.state.close()
+        try: os.unlink(self.socket_path)
+        except OSError: pass
+
+def serve_forever():
+    """Runs the daemon in the foreground until it receives 'shutdown' or Ctrl+C."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("❌ The EasyGit daemon needs Unix domain sockets, which this platform does not provide."); return 1
+    try:
+        server = EasyGitDaemon()
+    except OSError as e:
+        print(f"❌ Could not start the EasyGit daemon: {e.strerror or e}"); return 1
+    print(f"🛰️ EasyGit daemon listening on {server.socket_path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print("👋 EasyGit daemon stopped.")
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(serve_forever())
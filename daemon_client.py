@@ -0,0 +1,67 @@
+import json
+import socket
+import itertools
+import config
+
+_request_ids = itertools.count(1)
+
+class DaemonError(Exception):
+    """Raised when the daemon answers a request with a JSON-RPC error."""
+    def __init__(self, code, message):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+
+def is_available():
+    return hasattr(socket, "AF_UNIX")
+
+def call(method, timeout=30.0, **params):
+    """
+    Sends one JSON-RPC request to the daemon and returns its result. Raises
+    OSError if no daemon is listening and DaemonError for JSON-RPC errors.
+    """
+    request = {"jsonrpc": "2.0", "id": next(_request_ids), "method": method, "params": params}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(config.DAEMON_SOCKET)
+        sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise OSError("Daemon closed the connection without answering.")
+    response = json.loads(line)
+    if "error" in response:
+        raise DaemonError(response["error"].get("code"), response["error"].get("message"))
+    return response.get("result")
+
+def try_call(method, **params):
+    """Like call(), but returns None when the daemon is disabled, not running or failing."""
+    if not config.USE_DAEMON_WHEN_RUNNING or not is_available(): return None
+    try:
+        return call(method, **params)
+    except (OSError, ValueError, DaemonError):
+        return None
+
+def main(argv):
+    """
+    Thin command-line client for a running daemon (start one with `python daemon.py`):
+      python daemon_client.py METHOD [key=value ...]
+    Values are parsed as JSON when possible, e.g. repo=/path/to/repo porcelain=true limit=20
+    """
+    if not argv:
+        print(main.__doc__); return 2
+    params = {}
+    for arg in argv[1:]:
+        key, _, value = arg.partition("=")
+        try: params[key] = json.loads(value)
+        except ValueError: params[key] = value
+    try:
+        print(json.dumps(call(argv[0], **params), indent=2))
+        return 0
+    except OSError as e:
+        print(f"❌ Could not reach the EasyGit daemon at {config.DAEMON_SOCKET}: {e}"); return 1
+    except DaemonError as e:
+        print(f"❌ Daemon error: {e}"); return 1
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import utils
+import config
+
+SCAN_CACHE_NAME = "scan_cache"
+
+def list_stage_candidates(repo_path, pathspecs=None):
+    """
+    Lists modified and untracked (non-ignored) files that `git add` would pick up.
+    Directories in `pathspecs` are expanded by git itself.
+    """
+    command = ["git", "ls-files", "-z", "--modified", "--others", "--exclude-standard"]
+    if pathspecs:
+        command.append("--")
+        command.extend(pathspecs)
+    stdout, _, code = utils.run_command(command, cwd=repo_path, capture_output=True)
+    if code != 0 or not stdout:
+        return []
+    return list(dict.fromkeys(p for p in stdout.split("\0") if p))
+
+def _group_by_directory(rel_paths):
+    groups = {}
+    for rel_path in rel_paths:
+        rel_dir, _, name = rel_path.rpartition("/")
+        groups.setdefault(rel_dir, set()).add(name)
+    return groups
+
+def _stat_directory(repo_path, rel_dir, names):
+    """Stats the wanted entries of one directory with a single scandir pass."""
+    results = {}
+    abs_dir = os.path.join(repo_path, rel_dir) if rel_dir else repo_path
+    prefix = f"{rel_dir}/" if rel_dir else ""
+    try:
+        with os.scandir(abs_dir) as entries:
+            for entry in entries:
+                if entry.name not in names or not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                results[prefix + entry.name] = (st.st_size, st.st_mtime_ns)
+    except OSError:
+        pass # Directory vanished or is unreadable; its files are simply not flagged
+    return results
+
+def _sniff_binary(abs_path):
+    """Reports whether the first block of a file contains a NUL byte, like git's own heuristic."""
+    try:
+        with open(abs_path, 'rb') as f:
+            return b"\0" in f.read(config.BINARY_SNIFF_BYTES)
+    except OSError:
+        return False
+
+def scan_paths(repo_path, rel_paths):
+    """
+    Scans candidate paths in parallel and returns the ones that should not be staged as-is.
+    Each result is a dict with 'path', 'size', 'binary' and 'reason' ("large" or "binary"),
+    sorted by size (largest first). Binary sniff results are cached by (size, mtime),
+    so unchanged files are never re-read on later scans.
+    """
+    if not rel_paths:
+        return []
+    large_bytes = config.LARGE_FILE_THRESHOLD_MB * 1024 * 1024
+    binary_bytes = config.BINARY_FILE_THRESHOLD_KB * 1024
+
+    stats = {}
+    groups = _group_by_directory(rel_paths)
+    with ThreadPoolExecutor(max_workers=config.SCAN_WORKERS) as pool:
+        for partial in pool.map(lambda item: _stat_directory(repo_path, item[0], item[1]), groups.items()):
+            stats.update(partial)
+
+    cache = utils.load_json_cache(SCAN_CACHE_NAME)
+    repo_cache = cache.get(repo_path, {})
+    fresh_cache = {}
+    to_sniff = []
+    for rel_path, (size, mtime_ns) in stats.items():
+        if size < binary_bytes or size >= large_bytes:
+            continue # Too small to matter, or already flagged by size alone
+        cached = repo_cache.get(rel_path)
+        if cached and cached[0] == size and cached[1] == mtime_ns:
+            fresh_cache[rel_path] = cached
+        else:
+            to_sniff.append(rel_path)
+
+    if to_sniff:
+        with ThreadPoolExecutor(max_workers=config.SCAN_WORKERS) as pool:
+            sniffed = pool.map(lambda p: _sniff_binary(os.path.join(repo_path, p)), to_sniff)
+            for rel_path, is_binary in zip(to_sniff, sniffed):
+                size, mtime_ns = stats[rel_path]
+                fresh_cache[rel_path] = [size, mtime_ns, is_binary]
+
+    if fresh_cache != repo_cache:
+        cache[repo_path] = fresh_cache
+        utils.save_json_cache(SCAN_CACHE_NAME, cache)
+
+    flagged = []
+    for rel_path, (size, _) in stats.items():
+        if size >= large_bytes:
+            flagged.append({"path": rel_path, "size": size, "binary": None, "reason": "large"})
+        elif rel_path in fresh_cache and fresh_cache[rel_path][2]:
+            flagged.append({"path": rel_path, "size": size, "binary": True, "reason": "binary"})
+    flagged.sort(key=lambda item: item["size"], reverse=True)
+    return flagged
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+def is_lfs_available(repo_path):
+    _, _, code = utils.run_command(["git", "lfs", "version"], cwd=repo_path, capture_output=True)
+    return code == 0
+
+def route_to_lfs(repo_path, rel_paths):
+    """Tracks the given files with Git LFS (updates .gitattributes). Returns (ok, error)."""
+    _, stderr, code = utils.run_command(
+        ["git", "lfs", "track", "--filename", "--"] + list(rel_paths), cwd=repo_path, capture_output=True
+    )
+    return code == 0, stderr
+
+def _escape_gitignore_pattern(rel_path):
+    escaped = "".join(f"\\{ch}" if ch in "*?[]!#\\" else ch for ch in rel_path)
+    if escaped.endswith(" "):
+        escaped = escaped[:-1] + "\\ "
+    return "/" + escaped
+
+def route_to_gitignore(repo_path, rel_paths):
+    """Appends anchored, escaped entries for the given files to the repository's .gitignore."""
+    gitignore_path = os.path.join(repo_path, ".gitignore")
+    try:
+        needs_newline = False
+        if os.path.exists(gitignore_path) and os.path.getsize(gitignore_path) > 0:
+            with open(gitignore_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        with open(gitignore_path, 'a', encoding='utf-8') as f:
+            if needs_newline: f.write("\n")
+            f.write("# Added by EasyGit pre-stage scan\n")
+            for rel_path in rel_paths:
+                f.write(_escape_gitignore_pattern(rel_path) + "\n")
+        return True, None
+    except OSError as e:
+        return False, str(e)
@@ -0,0 +1,277 @@
+import os
+import sys
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import platform
+import threading
+import utils
+import config
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+               | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Only these git files affect `git status` output. In a linked worktree or submodule '.git'
+# is a file: per-worktree files live in the git dir, shared refs in the common dir.
+_GIT_DIR_FILES = ("index", "HEAD", "FETCH_HEAD")
+_COMMON_DIR_FILES = ("packed-refs",)
+
+def resolve_git_dirs(repo_path):
+    """Returns absolute (git_dir, common_dir) for repo_path, falling back to <repo>/.git for both."""
+    stdout, _, code = utils.run_command(["git", "rev-parse", "--absolute-git-dir", "--git-common-dir"], cwd=repo_path, capture_output=True)
+    lines = stdout.splitlines() if code == 0 and stdout else []
+    if len(lines) != 2:
+        fallback = os.path.join(repo_path, ".git")
+        return fallback, fallback
+    git_dir = lines[0]
+    return git_dir, os.path.normpath(os.path.join(repo_path, lines[1])) # common dir may be relative to repo_path
+
+class _BaseWatcher:
+    """Collects repository-relative paths that changed since the last drain."""
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self.git_dir, self.common_dir = resolve_git_dirs(repo_path)
+        self._lock = threading.Lock()
+        self._changed = set()
+        self._everything_changed = True # Nothing is known until the first snapshot
+
+    def _record(self, rel_path):
+        with self._lock:
+            self._changed.add(rel_path)
+
+    def _record_everything(self):
+        with self._lock:
+            self._everything_changed = True
+
+    def has_changes(self):
+        with self._lock:
+            return self._everything_changed or bool(self._changed)
+
+    def drain_changes(self):
+        """Returns (changed_paths, everything_changed) and starts a new snapshot."""
+        with self._lock:
+            changed, everything = self._changed, self._everything_changed
+            self._changed, self._everything_changed = set(), False
+        return changed, everything
+
+    def stop(self):
+        pass
+
+class InotifyWatcher(_BaseWatcher):
+    """Linux watcher built on inotify through ctypes; falls back to 'everything changed' if watches run out."""
+    def __init__(self, repo_path, libc):
+        super().__init__(repo_path)
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watch_dirs = {} # watch descriptor -> (absolute directory, label recorded for its events, recursive)
+        self._exhausted = False
+        self._stop = threading.Event()
+        self._add_tree(self.repo_path, "")
+        self._add_tree(self.git_dir, ".git", recursive=False)
+        if self.common_dir != self.git_dir:
+            self._add_tree(self.common_dir, os.path.join(".git", "common"), recursive=False)
+        self._add_tree(os.path.join(self.common_dir, "refs"), os.path.join(".git", "refs"))
+        self._thread = threading.Thread(target=self._run, name="easygit-inotify", daemon=True)
+        self._thread.start()
+
+    def _add_watch(self, abs_dir, label, recursive):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(abs_dir), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC: # fs.inotify.max_user_watches reached; cannot track reliably any more
+                self._exhausted = True
+            return False
+        self._watch_dirs[wd] = (abs_dir, label, recursive)
+        return True
+
+    def _add_tree(self, abs_root, label_root, recursive=True):
+        if self._exhausted or not self._add_watch(abs_root, label_root, recursive) or not recursive: return
+        pending = [(abs_root, label_root)]
+        while pending and not self._exhausted:
+            abs_dir, label = pending.pop()
+            try:
+                with os.scandir(abs_dir) as entries:
+                    for entry in entries:
+                        if not entry.is_dir(follow_symlinks=False): continue
+                        child = os.path.join(label, entry.name) if label else entry.name
+                        if child == ".git": continue # Only selected parts of the git dirs are watched
+                        if self._add_watch(entry.path, child, True): pending.append((entry.path, child))
+            except OSError:
+                pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready: continue
+                data = os.read(self._fd, 65536)
+            except (OSError, ValueError):
+                break
+            self._handle_events(data)
+        try: os.close(self._fd)
+        except OSError: pass
+
+    def _handle_events(self, data):
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_len].rstrip(b"\0"))
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                self._record_everything(); continue
+            watched = self._watch_dirs.get(wd)
+            if watched is None: continue
+            if mask & IN_IGNORED:
+                self._watch_dirs.pop(wd, None); continue
+            abs_dir, rel_dir, recursive = watched
+            rel_path = os.path.join(rel_dir, name) if rel_dir and name else (name or rel_dir)
+            self._record(rel_path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and recursive and rel_path != ".git":
+                self._add_tree(os.path.join(abs_dir, name), rel_path)
+
+    def has_changes(self):
+        return self._exhausted or super().has_changes()
+
+    def stop(self):
+        self._stop.set()
+
+class PollingWatcher(_BaseWatcher):
+    """Portable fallback: compares a (size, mtime) fingerprint of the tree on each check."""
+    def __init__(self, repo_path):
+        super().__init__(repo_path)
+        self._fingerprint = self._scan()
+
+    def _scan(self):
+        fingerprint = {}
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            abs_dir = os.path.join(self.repo_path, rel_dir) if rel_dir else self.repo_path
+            try:
+                with os.scandir(abs_dir) as entries:
+                    for entry in entries:
+                        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                        if rel_path == ".git": continue # Git files are fingerprinted from the resolved git dirs
+                        st = entry.stat(follow_symlinks=False)
+                        fingerprint[rel_path] = (st.st_size, st.st_mtime_ns)
+                        if entry.is_dir(follow_symlinks=False): pending.append(rel_path)
+            except OSError:
+                pass
+        self._scan_git_dirs(fingerprint)
+        return fingerprint
+
+    def _scan_git_dirs(self, fingerprint):
+        """Fingerprints what `git status` reads: index, HEAD and FETCH_HEAD, plus packed and loose refs."""
+        files = [(self.git_dir, name) for name in _GIT_DIR_FILES] + [(self.common_dir, name) for name in _COMMON_DIR_FILES]
+        for dirpath, _, filenames in os.walk(os.path.join(self.common_dir, "refs")):
+            files.extend((self.common_dir, os.path.relpath(os.path.join(dirpath, name), self.common_dir)) for name in filenames)
+        for base, rel_path in files:
+            try:
+                st = os.stat(os.path.join(base, rel_path))
+            except OSError:
+                continue
+            label = os.path.join(".git", rel_path) if base == self.git_dir else os.path.join(".git", "common", rel_path)
+            fingerprint[label] = (st.st_size, st.st_mtime_ns)
+
+    def has_changes(self):
+        current = self._scan()
+        previous, self._fingerprint = self._fingerprint, current
+        for rel_path in current.keys() | previous.keys():
+            if current.get(rel_path) != previous.get(rel_path):
+                self._record(rel_path)
+        return super().has_changes()
+
+def _load_libc():
+    if not sys.platform.startswith("linux"): return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch # Raise AttributeError if unavailable
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+def create_watcher(repo_path):
+    """Returns an inotify watcher where available, otherwise a polling watcher."""
+    libc = _load_libc()
+    if libc is not None:
+        try:
+            return InotifyWatcher(repo_path, libc)
+        except OSError:
+            pass
+    return PollingWatcher(repo_path)
+
+def enable_git_status_caches(repo_path):
+    """
+    Turns on git's untracked cache and, where git ships a built-in file system
+    monitor (macOS/Windows, git 2.37+), core.fsmonitor. Returns the settings applied.
+    """
+    applied = []
+    _, _, code = utils.run_command(["git", "config", "core.untrackedCache", "true"], cwd=repo_path, capture_output=True)
+    if code == 0:
+        utils.run_command(["git", "update-index", "--untracked-cache"], cwd=repo_path, capture_output=True)
+        applied.append("core.untrackedCache")
+    if platform.system() in ("Darwin", "Windows"):
+        _, _, supported = utils.run_command(["git", "fsmonitor--daemon", "status"], cwd=repo_path, capture_output=True)
+        if supported in (0, 1): # 1 just means "not running yet"; 129 means unsupported
+            _, _, code = utils.run_command(["git", "config", "core.fsmonitor", "true"], cwd=repo_path, capture_output=True)
+            if code == 0: applied.append("core.fsmonitor")
+    return applied
+
+class StatusCache:
+    """
+    Caches `git status` output per repository and argument list, invalidating it
+    only when the file system watcher saw something change.
+    """
+    def __init__(self):
+        self._repo_path = None
+        self._watcher = None
+        self._entries = {}
+
+    def _ensure_watcher(self, repo_path):
+        if self._repo_path == repo_path and self._watcher: return
+        if self._watcher: self._watcher.stop()
+        self._repo_path, self._watcher, self._entries = repo_path, create_watcher(repo_path), {}
+        if config.WATCHER_ENABLE_GIT_STATUS_CACHES:
+            enable_git_status_caches(repo_path)
+
+    def status(self, repo_path, args=()):
+        """Returns (stdout, stderr, returncode) of `git status <args>`, served from cache when unchanged."""
+        if not config.FS_WATCHER_ENABLED:
+            return utils.run_command(["git", "status"] + list(args), cwd=repo_path, capture_output=True)
+        self._ensure_watcher(repo_path)
+        if self._watcher.has_changes():
+            self._watcher.drain_changes() # Drain before running git so changes made meanwhile invalidate the next call
+            self._entries = {}
+        key = tuple(args)
+        if key not in self._entries:
+            # --no-optional-locks keeps status from rewriting the index, which would trigger the watcher itself.
+            result = utils.run_command(["git", "--no-optional-locks", "status"] + list(args), cwd=repo_path, capture_output=True)
+            if result[2] != 0: return result
+            self._entries[key] = result
+        return self._entries[key]
+
+    def invalidate(self):
+        self._entries = {}
+
+status_cache = StatusCache()
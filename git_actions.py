@@ -1,18 +1,35 @@
 
 import os
+import re
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from InquirerPy import inquirer
 from InquirerPy.base.control import Choice
 import utils
 import state
 import config
+import file_scanner
+import background_fetch
+import history
+import fs_watcher
+import repo_maintenance
+import mirror_sync
+import content_search
+import precommit_checks
+import worktrees
+import daemon_client
+import blame
+import repo_stats
+import submodules
+import repo_metadata
 
 def _fetch_remote_repo_list():
     print("⏳ Fetching your remote repositories...")
-    stdout, stderr, code = utils.run_command(
-        [config.GH_COMMAND, "repo", "list", "--json", "nameWithOwner,name,visibility,updatedAt,description", "--limit", "100"],
-        capture_output=True
-    )
+    cached_repos = daemon_client.try_call("remote_repos")
+    if cached_repos: return cached_repos
+    stdout, stderr, code = utils.run_command(utils.gh_repo_list_command(), capture_output=True)
     if code != 0:
         utils.clear_screen(); print("❌ Failed to fetch remote repository list.");
         if stderr: print(f"   Error: {stderr}"); return None
@@ -119,13 +136,59 @@ def view_remote_repositories():
     utils.clear_screen()
     if repos is None: return
     if not repos: print("ℹ️ You have no remote repositories on GitHub, or none could be retrieved."); return
+    metadata, errors = {}, []
+    if config.REMOTE_VIEW_ENRICH:
+        print(f"⏳ Fetching details for {len(repos)} repositories...")
+        metadata, errors = repo_metadata.fetch_metadata([repo['nameWithOwner'] for repo in repos])
+        utils.clear_screen()
     print("--- Your Remote GitHub Repositories ---")
     for repo in repos:
         desc_preview = repo.get('description') or "N/A"
         desc_preview = (desc_preview[:30] + '...') if len(desc_preview) > 33 else desc_preview
         print(f"  ➡️  {repo['nameWithOwner']:<35} (Vis: {repo.get('visibility', 'N/A'):<7} | Desc: {desc_preview:<35} | Upd: {repo.get('updatedAt', 'N/A')[:10]})")
+        meta = metadata.get(repo['nameWithOwner'])
+        if meta:
+            size = file_scanner.format_size(meta['diskUsage'] * 1024) if meta['diskUsage'] is not None else "N/A"
+            print(f"       🌿 {meta['defaultBranch'] or 'N/A'} | 💾 {size} | 🔤 {meta['primaryLanguage'] or 'N/A'}"
+                  f" | PRs: {meta['openPullRequests']} | Issues: {meta['openIssues']}" + (" | 🗄️ Archived" if meta['isArchived'] else ""))
     print("-" * 100)
+    if errors: print(f"⚠️ Some details could not be fetched: {errors[0]}")
+
+
+def sync_remote_mirrors():
+    """Clones missing and fetches existing local mirrors of all remote repositories, concurrently."""
+    if not utils.ensure_gh_installed_and_authed(): return
+    utils.clear_screen(); print("--- Sync Local Mirrors ---")
+    repos = _fetch_remote_repo_list()
+    if not repos: return
+    utils.clear_screen(); print(f"--- Sync Local Mirrors ({len(repos)} repositories) ---")
+    root_input = inquirer.text(message="Mirror root directory:", default=config.MIRROR_ROOT).execute()
+    if not root_input: utils.clear_screen(); print("Directory cannot be empty. Sync cancelled."); return
+    root_dir = os.path.abspath(os.path.expanduser(root_input))
+    mode = inquirer.select(
+        message="Mirror mode:",
+        choices=[Choice("bare", name="Bare mirrors (git clone --mirror; best for backup)"), Choice("worktree", name="Working-tree clones (for offline work)")],
+        default="bare", pointer="❯ ", qmark="🪞"
+    ).execute()
+    repo_names = [r["nameWithOwner"] for r in repos]
+    pending = mirror_sync.pending_from_previous_run(root_dir, mode)
+    if pending and inquirer.confirm(message=f"A previous sync left {len(pending)} repositories unfinished. Resume only those?", default=True).execute():
+        repo_names = [name for name in pending if name in set(repo_names)] or repo_names
+    utils.clear_screen()
+    print(f"⏳ Syncing {len(repo_names)} repositories into '{root_dir}' ({mode}, {config.MIRROR_SYNC_WORKERS} at a time)...")
+    width = max(len(name) for name in repo_names)
+
+    def on_result(result):
+        status = "✅" if result["ok"] else "❌"
+        detail = f"{result['kib'] / 1024:8.1f} MiB" if result["ok"] else (result["error"].splitlines()[-1] if result["error"] else "failed")
+        print(f"  {status} {result['repo']:<{width}}  {result['action']:<5} {result['seconds']:6.1f}s  {detail}")
 
+    results, elapsed = mirror_sync.sync_mirrors(repo_names, root_dir, mode, on_result=on_result)
+    summary = mirror_sync.throughput_summary(results, elapsed)
+    print("\n--- Mirror Sync Summary ---")
+    print(f"  {summary['succeeded']}/{summary['repos']} succeeded ({summary['cloned']} cloned, {summary['fetched']} fetched, {summary['failed']} failed)")
+    print(f"  {summary['elapsed']:.1f}s total | {summary['repos_per_min']:.1f} repos/min | {summary['mib']:.1f} MiB at {summary['mib_per_s']:.2f} MiB/s")
+    if summary["failed"]: print("  ℹ️ Run the sync again to resume the failed repositories.")
 
 def delete_remote_repository():
     if not utils.ensure_gh_installed_and_authed(): return
@@ -171,6 +234,11 @@ def rename_remote_repository():
         if stderr: print(f"   Error: {stderr}");
         if stdout: print(f"   Output: {stdout}")
 
+def _activate_repository(path):
+    """Makes path the active repository and wakes the background fetcher so ahead/behind counts are fresh."""
+    state.current_repo_path = path; utils.remember_repository(path)
+    background_fetch.worker.request_fetch()
+
 def set_current_repository():
     """Prompts user for a repo path and initializes if needed."""
     while True:
@@ -189,7 +257,7 @@ def set_current_repository():
 
         if os.path.isdir(path):
             if utils.is_git_repository(path):
-                state.current_repo_path = path
+                _activate_repository(path)
                 print(f"✅ Current repository set to: {state.current_repo_path}")
                 return True
             else:
@@ -202,7 +270,7 @@ def set_current_repository():
                     _, err, code = utils.run_command(["git", "init"], cwd=path)
                     if code == 0:
                         print(f"✅ Initialized empty Git repository in {path}")
-                        state.current_repo_path = path
+                        _activate_repository(path)
                         return True
                     else:
                         print(f"❌ Failed to initialize repository: {err}")
@@ -234,6 +302,97 @@ def authenticate_github_account():
     print("\n🔎 Verifying current GitHub authentication status:")
     utils.ensure_gh_installed_and_authed()
 
+CLONE_DEFAULTS_CACHE = "clone_defaults"
+
+def _clone_git_args(options):
+    """Translates clone options into `git clone` flags."""
+    args = []
+    if options.get("filter"): args.append(f"--filter={options['filter']}")
+    if options.get("depth"): args.extend(["--depth", str(options["depth"])])
+    if options.get("single_branch"): args.append("--single-branch")
+    elif options.get("depth"): args.append("--no-single-branch") # --depth implies --single-branch otherwise
+    if options.get("sparse_patterns"): args.append("--sparse")
+    return args
+
+def _prompt_clone_options(repo_key):
+    """Asks how to clone `repo_key`, pre-filled with its remembered settings, and optionally remembers the answer."""
+    remembered = utils.load_json_cache(CLONE_DEFAULTS_CACHE).get(repo_key)
+    defaults = dict(config.DEFAULT_CLONE_OPTIONS)
+    if remembered:
+        defaults.update(remembered)
+        print(f"ℹ️ Using remembered clone settings for '{repo_key}' as defaults.")
+    clone_filter = inquirer.select(
+        message="Clone type:",
+        choices=[
+            Choice(None, name="Full clone (all history and file contents)"),
+            Choice("blob:none", name="Blobless partial clone (file contents fetched on demand)"),
+            Choice("tree:0", name="Treeless partial clone (fastest; best for build-only checkouts)"),
+        ],
+        default=defaults.get("filter"), pointer="❯ ", qmark="📥"
+    ).execute()
+    depth_input = inquirer.text(
+        message="Shallow clone depth (blank for full history):",
+        default=str(defaults["depth"]) if defaults.get("depth") else "",
+        validate=lambda t: t == "" or (t.isdigit() and int(t) > 0), invalid_message="Enter a positive number or leave blank."
+    ).execute()
+    single_branch = inquirer.confirm(message="Fetch only the default branch (--single-branch)?", default=bool(defaults.get("single_branch"))).execute()
+    sparse_input = inquirer.text(
+        message="Sparse-checkout directories (comma-separated, blank for the whole tree):",
+        default=", ".join(defaults.get("sparse_patterns") or [])
+    ).execute()
+    options = {
+        "filter": clone_filter,
+        "depth": int(depth_input) if depth_input else None,
+        "single_branch": single_branch,
+        "sparse_patterns": [p.strip().strip("/") for p in (sparse_input or "").split(",") if p.strip().strip("/")],
+    }
+    if options != remembered and inquirer.confirm(message=f"Remember these clone settings for '{repo_key}'?", default=True).execute():
+        clone_defaults = utils.load_json_cache(CLONE_DEFAULTS_CACHE)
+        clone_defaults[repo_key] = options
+        utils.save_json_cache(CLONE_DEFAULTS_CACHE, clone_defaults)
+    utils.clear_screen()
+    return options
+
+def _clone_with_options(repo_ref, target_path, options):
+    """Clones `repo_ref` via gh into `target_path` using the given clone options. Returns True on success."""
+    clone_cmd = [config.GH_COMMAND, "repo", "clone", repo_ref, target_path]
+    git_args = _clone_git_args(options)
+    if git_args: clone_cmd.extend(["--"] + git_args)
+    _, err, code = utils.run_command(clone_cmd)
+    if code != 0:
+        print(f"❌ Failed to clone '{repo_ref}'." + (f" Error: {err}" if err else ""))
+        return False
+    if options.get("sparse_patterns"):
+        _, err_s, code_s = utils.run_command(
+            ["git", "sparse-checkout", "set", "--cone"] + options["sparse_patterns"], cwd=target_path, capture_output=True
+        )
+        if code_s == 0: print(f"   ✅ Sparse checkout limited to: {', '.join(options['sparse_patterns'])}")
+        else: print(f"   ⚠️ Could not configure sparse checkout: {err_s}")
+    return True
+
+def _qualified_repo_name(repo_name):
+    """Returns 'owner/name' for a repo name that may omit the owner (gh then uses the authenticated user)."""
+    if "/" in repo_name: return repo_name
+    login, _, code = utils.run_command([config.GH_COMMAND, "api", "user", "--jq", ".login"], capture_output=True)
+    return f"{login}/{repo_name}" if code == 0 and login else repo_name
+
+def clone_github_repository():
+    """Clones one of the user's GitHub repositories with partial/shallow/sparse options."""
+    if not utils.ensure_gh_installed_and_authed(): return
+    utils.clear_screen(); print("--- Clone Existing GitHub Repo ---")
+    repo_to_clone = _select_remote_repository("Select repository to clone:")
+    if not repo_to_clone: print("Cloning cancelled."); return
+    target_input = inquirer.text(message="Clone into directory:", default=repo_to_clone.split("/")[-1]).execute()
+    if not target_input: utils.clear_screen(); print("Directory cannot be empty. Cloning cancelled."); return
+    target_path = os.path.abspath(target_input)
+    utils.clear_screen()
+    if os.path.exists(target_path): print(f"❌ Error: '{target_path}' already exists."); return
+    options = _prompt_clone_options(repo_to_clone)
+    print(f"⏳ Cloning '{repo_to_clone}' into '{target_path}'...")
+    if _clone_with_options(repo_to_clone, target_path, options):
+        _activate_repository(target_path)
+        print(f"✅ Cloned '{repo_to_clone}'. Active repo set to: {target_path}")
+
 def create_github_repository(): # This is for creating a NEW EMPTY repo and optionally cloning
     if not utils.ensure_gh_installed_and_authed(): return
     utils.clear_screen(); print("--- Create New Empty GitHub Repo (and optionally clone) ---")
@@ -250,7 +409,7 @@ def create_github_repository(): # This is for creating a NEW EMPTY repo and opti
     ).execute()
 
     # Define where the clone would go if chosen
-    # `gh repo create NAME --clone` creates a directory `NAME` in the CWD.
+    # The clone goes into a directory `NAME` in the CWD, like `gh repo create NAME --clone`.
     target_clone_path = os.path.abspath(os.path.join(".", repo_name)) # Assumes clone in CWD
 
     utils.clear_screen() # Clear before executing gh command
@@ -261,17 +420,19 @@ def create_github_repository(): # This is for creating a NEW EMPTY repo and opti
         print(f"   Please remove or rename it, or choose not to clone locally for now.")
         return
 
+    # Remember clone settings under 'owner/name', the key clone_github_repository looks them up by.
+    repo_key = _qualified_repo_name(repo_name) if should_clone_locally else repo_name
+    clone_options = _prompt_clone_options(repo_key) if should_clone_locally else None
+
     gh_cmd_list = [config.GH_COMMAND, "repo", "create", repo_name, f"--{visibility}"]
     if description: gh_cmd_list.extend(["--description", description])
     
     if should_clone_locally:
-        gh_cmd_list.append("--clone") # gh will create the directory and clone into it
         print(f"⏳ Creating GitHub repository '{repo_name}' and cloning to '{target_clone_path}'...")
     else:
         print(f"⏳ Creating remote GitHub repository '{repo_name}' (no local clone)...")
 
     # Run `gh repo create` from the current working directory.
-    # If --clone is used, `gh` will create a subdirectory named `repo_name` inside CWD.
     stdout, stderr, code = utils.run_command(gh_cmd_list, cwd=".", capture_output=True)
     
     # utils.clear_screen() # Let user see output before this title
@@ -282,14 +443,17 @@ def create_github_repository(): # This is for creating a NEW EMPTY repo and opti
         if stdout: print(f"   Output from gh (usually includes URL): {stdout}")
         
         if should_clone_locally:
-            if os.path.isdir(target_clone_path) and utils.is_git_repository(target_clone_path):
-                state.current_repo_path = target_clone_path
+            # Clone separately (rather than `gh repo create --clone`) so partial/shallow/sparse options apply.
+            if not _clone_with_options(repo_key, target_clone_path, clone_options):
+                print("   ℹ️ The remote repository was created. You may need to clone it manually.")
+            elif os.path.isdir(target_clone_path) and utils.is_git_repository(target_clone_path):
+                _activate_repository(target_clone_path)
                 print(f"   ✅ Successfully cloned to: {state.current_repo_path}")
                 print(f"   ℹ️ Current active repository for this tool set to: {state.current_repo_path}")
                 
                 # Optional: Add initial README to the newly cloned empty repo
                 readme_p = os.path.join(state.current_repo_path, "README.md")
-                if not os.path.exists(readme_p): # Check if gh --clone already made one
+                if not os.path.exists(readme_p): # Check if the clone already brought one
                     utils.clear_screen(); print("--- Initial Commit for Cloned Repo ---")
                     if inquirer.confirm(message="Create a default README.md, commit, and push?", default=True).execute():
                         utils.clear_screen(); print("📝 Creating and pushing README.md...")
@@ -305,7 +469,7 @@ def create_github_repository(): # This is for creating a NEW EMPTY repo and opti
                         if code_p == 0: print("   ✅ README created, committed, and pushed.")
                         else: print(f"   ❌ Failed to push initial README. Error: {err_p}")
             else:
-                print(f"   ⚠️  Clone was requested, but the expected directory '{target_clone_path}' was not found or is not a Git repo after 'gh repo create --clone'.")
+                print(f"   ⚠️  Clone was requested, but the expected directory '{target_clone_path}' was not found or is not a Git repo after cloning.")
                 print(f"      The remote repository was likely created. You may need to clone it manually.")
     else:
         # This is where your error occurs
@@ -321,9 +485,32 @@ def create_github_repository(): # This is for creating a NEW EMPTY repo and opti
 def view_status():
     if not state.current_repo_path: print("⚠️ No repository selected."); return
     print(f"--- Git Status for {os.path.basename(state.current_repo_path)} ---")
-    utils.run_command(["git", "status"], cwd=state.current_repo_path)
+    from_daemon = daemon_client.try_call("status", repo=state.current_repo_path)
+    if from_daemon: stdout, stderr, code = from_daemon["output"], from_daemon["error"], from_daemon["code"]
+    else: stdout, stderr, code = fs_watcher.status_cache.status(state.current_repo_path)
+    if code == 0: print(stdout)
+    else: print(f"❌ Error getting status: {stderr}")
+    if utils.has_submodules(state.current_repo_path): _print_submodule_summary(state.current_repo_path)
     print("-" * (len(f"--- Git Status for {os.path.basename(state.current_repo_path)} ---")))
 
+def _print_submodule_summary(repo_path):
+    statuses = submodules.status_summary(repo_path)
+    if not statuses: return
+    print(f"\n--- Submodules ({len(statuses)}) ---")
+    width = max(len(s["path"]) for s in statuses)
+    for sub in statuses:
+        if not sub["initialized"]: print(f"  ⚪ {sub['path']:<{width}}  not initialized"); continue
+        if sub["error"]: print(f"  ❌ {sub['path']:<{width}}  {sub['error']}"); continue
+        details = [sub["branch"] or f"detached at {sub['sha'][:8]}"]
+        if sub["state"] == "+": details.append("checkout differs from recorded commit")
+        if sub["ahead"] or sub["behind"]: details.append(f"↑{sub['ahead']} ↓{sub['behind']}")
+        elif sub["unpushed"]: details.append(f"{sub['unpushed']} unpushed")
+        if sub["changed"]: details.append(f"{sub['changed']} changed")
+        if sub["untracked"]: details.append(f"{sub['untracked']} untracked")
+        if sub["conflicts"]: details.append(f"{sub['conflicts']} conflicts")
+        clean = sub["state"] == " " and not (sub["unpushed"] or sub["behind"] or sub["changed"] or sub["untracked"] or sub["conflicts"])
+        print(f"  {'✅' if clean else '⚠️'} {sub['path']:<{width}}  {' | '.join(details)}")
+
 def modify_file():
     if not state.current_repo_path: print("⚠️ No repository selected."); return
     print("--- Modify/Create File ---")
@@ -347,10 +534,61 @@ def modify_file():
     elif os.path.isdir(os.path.join(state.current_repo_path, selected_item)): print(f"ℹ️ '{selected_item}' is a directory.")
     else: utils.select_editor_and_edit(os.path.join(state.current_repo_path, selected_item))
 
+def _review_prestage_scan(repo_path, pathspecs=None):
+    """
+    Scans what is about to be staged for large or binary files and routes them
+    to Git LFS or .gitignore. Returns (withheld_paths, extra_paths): files to leave
+    out of `git add` and files to add with it, or None if the user cancelled staging.
+    """
+    if not config.PRESTAGE_SCAN_ENABLED: return [], []
+    print("🔎 Scanning files to be staged for large or binary content...")
+    candidates = file_scanner.list_stage_candidates(repo_path, pathspecs)
+    flagged = file_scanner.scan_paths(repo_path, candidates)
+    if not flagged: return [], []
+    flagged_paths = [item["path"] for item in flagged]
+    lfs_available = file_scanner.is_lfs_available(repo_path)
+
+    route = config.PRESTAGE_AUTO_ROUTE
+    if route is None:
+        utils.clear_screen(); print("--- Pre-stage Scan ---")
+        print(f"⚠️ {len(flagged)} large or binary file(s) are about to be staged:")
+        for item in flagged[:20]:
+            print(f"   {item['path']} ({file_scanner.format_size(item['size'])}, {item['reason']})")
+        if len(flagged) > 20: print(f"   ... and {len(flagged) - 20} more")
+        choices = []
+        if lfs_available: choices.append(Choice("lfs", name="Track them with Git LFS and stage"))
+        choices.extend([
+            Choice("gitignore", name="Add them to .gitignore (don't stage)"),
+            Choice("skip", name="Leave them unstaged this time"),
+            Choice("stage", name="Stage them anyway"),
+            Choice(None, name="[Cancel]"),
+        ])
+        route = inquirer.select(message="How should these files be handled?", choices=choices, pointer="❯ ", qmark="📦").execute()
+        utils.clear_screen()
+        if route is None: return None
+    elif route == "lfs" and not lfs_available:
+        print("⚠️ Git LFS is not installed; leaving large/binary files unstaged.")
+        route = "skip"
+
+    if route == "lfs":
+        ok, err = file_scanner.route_to_lfs(repo_path, flagged_paths)
+        if ok: print(f"✅ {len(flagged_paths)} file(s) now tracked with Git LFS."); return [], [".gitattributes"]
+        print(f"❌ Failed to track files with Git LFS: {err}. Leaving them unstaged.")
+        return flagged_paths, []
+    if route == "gitignore":
+        ok, err = file_scanner.route_to_gitignore(repo_path, flagged_paths)
+        if ok: print(f"✅ {len(flagged_paths)} file(s) added to .gitignore."); return flagged_paths, [".gitignore"]
+        print(f"❌ Failed to update .gitignore: {err}. Leaving files unstaged.")
+        return flagged_paths, []
+    if route == "skip":
+        print(f"ℹ️ Leaving {len(flagged_paths)} large/binary file(s) unstaged.")
+        return flagged_paths, []
+    return [], []
+
 def stage_changes():
     if not state.current_repo_path: print("⚠️ No repository selected."); return
     print("--- Stage Changes ---"); print("🔎 Checking for changes...")
-    stdout_status, _, _ = utils.run_command(["git", "status", "--porcelain"], cwd=state.current_repo_path, capture_output=True)
+    stdout_status, _, _ = fs_watcher.status_cache.status(state.current_repo_path, ["--porcelain"])
     if not stdout_status: print("✅ No changes to stage."); return
     changed_files = [line[3:] for line in stdout_status.splitlines()]
     choices = [Choice("all", name="[Stage ALL Changes] (git add .)")]
@@ -359,16 +597,103 @@ def stage_changes():
     action = inquirer.select(message="Select files to stage or stage all:", choices=choices, multiselect=True, validate=lambda r: len(r) >= 1, invalid_message="Must select at least one.", qmark="➕").execute()
     utils.clear_screen()
     if action is None or not action: print("Staging cancelled."); return
+    files_to_stage = [f for f in action if f not in ("all", None)]
+    if "all" not in action and not files_to_stage: print("Staging cancelled."); return
+    review = _review_prestage_scan(state.current_repo_path, None if "all" in action else files_to_stage)
+    if review is None: print("Staging cancelled."); return
+    withheld, extra = review
     if "all" in action:
-        _, err, code = utils.run_command(["git", "add", "."], cwd=state.current_repo_path)
-        if code == 0: print("✅ All changes staged.")
+        exclude = [f":(exclude,literal){p}" for p in withheld]
+        _, err, code = utils.run_command(["git", "add", "--", "."] + exclude, cwd=state.current_repo_path, capture_output=True)
+        if code == 0: print("✅ All changes staged." if not exclude else "✅ All other changes staged.")
         else: print(f"❌ Error staging all changes: {err}")
     else:
-        files_to_stage = [f for f in action if f != "all"]
-        if files_to_stage:
-            _, err, code = utils.run_command(["git", "add"] + files_to_stage, cwd=state.current_repo_path)
-            if code == 0: print(f"✅ Staged: {', '.join(files_to_stage)}")
-            else: print(f"❌ Error staging files: {err}")
+        # Withheld files picked explicitly are dropped from the list (an explicit path that is now
+        # ignored makes `git add` fail); ones inside a picked directory are excluded by pathspec.
+        withheld_set = set(withheld)
+        staged = [f for f in files_to_stage if f not in withheld_set] + extra
+        exclude = [f":(exclude,literal){p}" for p in withheld if p not in files_to_stage]
+        if not staged: print("ℹ️ Nothing left to stage."); return
+        _, err, code = utils.run_command(["git", "add", "--"] + staged + exclude, cwd=state.current_repo_path, capture_output=True)
+        if code == 0: print(f"✅ Staged: {', '.join(staged)}")
+        else: print(f"❌ Error staging files: {err}")
+
+def _parse_numstat_z(output):
+    """
+    Parses `git diff --numstat -z` output into dicts with 'path', 'old_path',
+    'added' and 'deleted' (None for binary files).
+    """
+    entries = []
+    tokens = output.split("\0")
+    i = 0
+    while i < len(tokens):
+        fields = tokens[i].split("\t")
+        i += 1
+        if len(fields) != 3: continue
+        added, deleted, path = fields
+        old_path = None
+        if not path and i + 1 < len(tokens): # Rename/copy: paths follow as separate NUL-terminated tokens
+            old_path, path = tokens[i], tokens[i + 1]
+            i += 2
+        entries.append({
+            "path": path, "old_path": old_path,
+            "added": int(added) if added.isdigit() else None,
+            "deleted": int(deleted) if deleted.isdigit() else None,
+        })
+    return entries
+
+def review_staged_changes():
+    """
+    Shows a cheap numstat overview of what is staged and streams the diff of a
+    file into the pager only when that file is opened.
+    """
+    if not state.current_repo_path: print("⚠️ No repository selected."); return
+    while True:
+        stdout, stderr, code = utils.run_command(
+            ["git", "diff", "--staged", "--numstat", "-z", "-M"], cwd=state.current_repo_path, capture_output=True
+        )
+        if code != 0: print(f"❌ Could not read staged changes: {stderr}"); return
+        entries = _parse_numstat_z(stdout or "")
+        if not entries: print("ℹ️ No changes staged for commit."); return
+        total_added = sum(e["added"] or 0 for e in entries)
+        total_deleted = sum(e["deleted"] or 0 for e in entries)
+        utils.clear_screen()
+        print(f"--- Staged Changes: {len(entries)} file(s), +{total_added} -{total_deleted} ---")
+        choices = []
+        for entry in entries:
+            counts = "binary" if entry["added"] is None else f"+{entry['added']} -{entry['deleted']}"
+            label = f"{entry['old_path']} → {entry['path']}" if entry["old_path"] else entry["path"]
+            choices.append(Choice(entry["path"], name=f"{label}  ({counts})"))
+        choices.append(Choice("ALL_FILES", name="[View Full Staged Diff]"))
+        choices.append(Choice(None, name="[Done Reviewing]"))
+        selected = inquirer.select(message="Select a file to view its staged diff:", choices=choices, pointer="❯ ", qmark="🔍", cycle=True).execute()
+        utils.clear_screen()
+        if selected is None: return
+        diff_command = ["git", "diff", "--staged", "--color=always", "-M"]
+        if selected != "ALL_FILES":
+            diff_command.extend(["--", selected])
+            old_path = next((e["old_path"] for e in entries if e["path"] == selected), None)
+            if old_path: diff_command.append(old_path)
+        utils.page_command_output(diff_command, cwd=state.current_repo_path)
+
+def _run_precommit_checks(repo_path):
+    """Runs the configured pre-commit checks and reports per-check timing. Returns True if the commit may proceed."""
+    if not config.PRECOMMIT_CHECKS: return True
+    print(f"🧪 Running {len(config.PRECOMMIT_CHECKS)} pre-commit check(s) on staged files...")
+    started = time.perf_counter()
+    reports = precommit_checks.run_checks(repo_path)
+    if not reports: print("ℹ️ No staged files to check."); return True
+    for report in reports:
+        status = "✅" if report["ok"] else "❌"
+        print(f"  {status} {report['name']:<20} {report['seconds']:6.2f}s  ({report['checked']} checked, {report['cached']} cached)")
+    print(f"   Total wall time: {time.perf_counter() - started:.2f}s")
+    failed = [r for r in reports if not r["ok"]]
+    if not failed: return True
+    for report in failed:
+        for files, output in report["failures"]:
+            print(f"\n--- {report['name']} failed on: {', '.join(files[:5])}{' ...' if len(files) > 5 else ''} ---")
+            print(output[-2000:] if output else "(no output)")
+    return inquirer.confirm(message="Some checks failed. Commit anyway?", default=False).execute()
 
 def commit_changes():
     if not state.current_repo_path: print("⚠️ No repository selected."); return
@@ -385,15 +710,74 @@ def commit_changes():
     _, _, code_status_after_add = utils.run_command(["git", "diff", "--staged", "--quiet"], cwd=state.current_repo_path, capture_output=True)
     if code_status_after_add == 0 and code_status == 0: return
     utils.clear_screen(); print("--- Commit Changes ---")
+    if inquirer.confirm(message="Review staged changes before committing?", default=False).execute():
+        utils.clear_screen(); review_staged_changes()
+        utils.clear_screen(); print("--- Commit Changes ---")
     commit_message = inquirer.text(message="Enter commit message:", validate=lambda t: len(t) > 0, invalid_message="Commit message cannot be empty.").execute()
     utils.clear_screen()
     if not commit_message: print("Commit aborted (empty message)."); return
+    if not _run_precommit_checks(state.current_repo_path): utils.clear_screen(); print("Commit cancelled (checks failed)."); return
     stdout_c, err_c, code_c = utils.run_command(["git", "commit", "-m", commit_message], cwd=state.current_repo_path, capture_output=True)
     if code_c == 0: print("✅ Changes committed successfully."); print(f"   Output:\n{stdout_c}" if stdout_c else "")
     else:
         if "nothing to commit" in err_c.lower() or (stdout_c and "nothing to commit" in stdout_c.lower()): print("ℹ️ Nothing to commit.")
         else: print(f"❌ Error committing changes:\n{err_c if err_c else stdout_c}")
 
+def _push_to_remotes_concurrently(repo_path, remotes, branch, upstream_remote=None):
+    """
+    Pushes `branch` to several remotes at once (at most config.PUSH_CONCURRENCY in flight),
+    streaming each remote's progress with a prefix and printing per-remote results at the end.
+    """
+    utils.clear_screen(); print("--- Push Changes (Parallel) ---")
+    print(f"⏳ Pushing branch '{branch}' to {len(remotes)} remotes: {', '.join(remotes)}")
+    width = max(len(r) for r in remotes)
+    print_lock = threading.Lock()
+    recurse_check = ["--recurse-submodules=check"] if utils.has_submodules(repo_path) else []
+
+    def push_one(remote):
+        def on_line(line, is_progress):
+            with print_lock: print(f"   [{remote:<{width}}] {line}")
+        command = ["git", "push", "--progress"] + (["-u"] if remote == upstream_remote else []) + recurse_check + [remote, branch]
+        started = time.monotonic()
+        # Credential prompts from parallel pushes would fight over the terminal; rely on credential helpers instead.
+        last_lines, code = utils.stream_command(command, cwd=repo_path, env=utils.NO_PROMPT_ENV, on_line=on_line, progress_interval=0.5)
+        return remote, code, time.monotonic() - started, last_lines
+
+    with background_fetch.worker.network_lock():
+        with ThreadPoolExecutor(max_workers=max(1, config.PUSH_CONCURRENCY)) as pool:
+            results = list(pool.map(push_one, remotes))
+
+    print("\n--- Push Results ---")
+    for remote, code, elapsed, last_lines in results:
+        if code == 0: print(f"  ✅ {remote:<{width}}  pushed in {elapsed:.1f}s")
+        else: print(f"  ❌ {remote:<{width}}  failed after {elapsed:.1f}s: {last_lines[-1] if last_lines else f'exit code {code}'}")
+    failed = sum(1 for _, code, _, _ in results if code != 0)
+    print(f"{'✅' if not failed else '⚠️'} {len(results) - failed}/{len(results)} remotes pushed successfully.")
+
+def _push_submodules_first(repo_path):
+    """Offers to push submodules with unpushed commits concurrently. Returns False if the superproject push should stop."""
+    print("🔍 Checking submodules for unpushed commits...")
+    dirty = [s for s in submodules.status_summary(repo_path) if s["unpushed"] > 0]
+    if not dirty: return True
+    utils.clear_screen(); print("--- Push Changes: Submodules ---")
+    for sub in dirty: print(f"  ⬆️ {sub['path']}  ({sub['unpushed']} unpushed commit(s) on {sub['branch'] or 'detached HEAD'})")
+    if not inquirer.confirm(message=f"Push these {len(dirty)} submodule(s) first (in parallel)?", default=True).execute():
+        print("ℹ️ Submodules not pushed; the superproject push will be refused if it records unpublished submodule commits.")
+        return True
+    width = max(len(s["path"]) for s in dirty)
+    print_lock = threading.Lock()
+    def on_progress(path, line):
+        with print_lock: print(f"   [{path:<{width}}] {line}")
+    with background_fetch.worker.network_lock():
+        results = submodules.push_dirty_submodules(repo_path, dirty, on_progress)
+    print("\n--- Submodule Push Results ---")
+    for path, ok, elapsed, error in results:
+        if ok: print(f"  ✅ {path:<{width}}  pushed in {elapsed:.1f}s")
+        else: print(f"  ❌ {path:<{width}}  {error}")
+    if len(results) < len(dirty) or not all(ok for _, ok, _, _ in results):
+        print("❌ Not all submodules were pushed; the superproject was not pushed."); return False
+    return True
+
 def push_changes():
     if not state.current_repo_path: print("⚠️ No repository selected."); return
     print("--- Push Changes ---")
@@ -405,31 +789,283 @@ def push_changes():
     current_remote = "origin"
     if len(remotes) == 1: current_remote = remotes[0]
     elif "origin" not in remotes and remotes: current_remote = remotes[0]
+    target_remotes = None
     if len(remotes) > 1:
          utils.clear_screen(); print("--- Push Changes ---")
-         selected_remote = inquirer.select(message="Select remote to push to:", choices=remotes, default=current_remote).execute()
+         remote_choices = [Choice(r, name=r) for r in remotes]
+         remote_choices.append(Choice("ALL_REMOTES", name="[All Remotes] (in parallel)"))
+         remote_choices.append(Choice("SELECT_REMOTES", name="[Select Several Remotes] (in parallel)"))
+         selected_remote = inquirer.select(message="Select remote to push to:", choices=remote_choices, default=current_remote).execute()
          utils.clear_screen();
          if not selected_remote: print("Push cancelled."); return
-         current_remote = selected_remote
-    push_command = ["git", "push"]
+         if selected_remote == "ALL_REMOTES": target_remotes = remotes
+         elif selected_remote == "SELECT_REMOTES":
+             target_remotes = inquirer.checkbox(
+                 message="Select remotes to push to:", choices=[Choice(r, name=r, enabled=True) for r in remotes],
+                 validate=lambda r: len(r) >= 1, invalid_message="Must select at least one.", qmark="⬆️"
+             ).execute()
+             utils.clear_screen()
+             if not target_remotes: print("Push cancelled."); return
+         else: current_remote = selected_remote
+         if target_remotes and len(target_remotes) == 1: current_remote, target_remotes = target_remotes[0], None
+    push_command = ["git", "push"]; set_upstream_remote = None
     _, _, upstream_check_code = utils.run_command(["git", "rev-parse", "--abbrev-ref", f"{current_branch}@{{u}}"], cwd=state.current_repo_path, capture_output=True)
     if upstream_check_code != 0:
+        upstream_remote = current_remote if not target_remotes or current_remote in target_remotes else target_remotes[0]
         utils.clear_screen(); print("--- Push Changes ---")
-        print(f"ℹ️ Upstream for branch '{current_branch}' on remote '{current_remote}' not set.")
-        if inquirer.confirm(message=f"Set upstream to '{current_remote}/{current_branch}' and push?", default=True).execute(): push_command.extend(["-u", current_remote, current_branch])
+        print(f"ℹ️ Upstream for branch '{current_branch}' on remote '{upstream_remote}' not set.")
+        if inquirer.confirm(message=f"Set upstream to '{upstream_remote}/{current_branch}' and push?", default=True).execute():
+            push_command.extend(["-u", upstream_remote, current_branch]); set_upstream_remote = upstream_remote
         else: utils.clear_screen(); print("Push cancelled."); return
+    if utils.has_submodules(state.current_repo_path):
+        if not _push_submodules_first(state.current_repo_path): return
+        push_command.insert(2, "--recurse-submodules=check") # Refuse to push commits recording unpublished submodule commits
+    if target_remotes:
+        _push_to_remotes_concurrently(state.current_repo_path, target_remotes, current_branch, set_upstream_remote)
+        return
     utils.clear_screen(); print("--- Push Changes ---")
     print(f"⏳ Attempting to push branch '{current_branch}' to remote '{current_remote}'...")
-    stdout, stderr, code = utils.run_command(push_command, cwd=state.current_repo_path, capture_output=True)
+    with background_fetch.worker.network_lock():
+        stdout, stderr, code = utils.run_command(push_command, cwd=state.current_repo_path, capture_output=True)
     if code == 0: print("✅ Changes pushed successfully."); print(f"   Output:\n{stdout}" if stdout else "")
     else: print(f"❌ Error pushing changes:"); print(f"   Error Output:\n{stderr}" if stderr else ""); print(f"   Standard Output:\n{stdout}" if stdout else "")
 
+def _pull_with_submodules(repo_path):
+    print("⏳ Pulling and updating submodules...")
+    print_lock = threading.Lock()
+    def on_progress(path, message):
+        with print_lock: print(f"   [{path}] {message}" if path else f"   {message}")
+    with background_fetch.worker.network_lock():
+        ok, last_lines, updated = submodules.pull_recursive(repo_path, on_progress)
+    fs_watcher.status_cache.invalidate()
+    if not ok:
+        print("❌ Error pulling changes:"); print("\n".join(f"   {line}" for line in last_lines)); return
+    print("✅ Changes pulled successfully.")
+    for path, (old_sha, new_sha) in updated.items():
+        print(f"   🔄 {path}: {old_sha[:8] if old_sha else 'new'} → {new_sha[:8]}")
+    if not updated: print("   ℹ️ No submodule changed.")
+
 def pull_changes():
     if not state.current_repo_path: print("⚠️ No repository selected."); return
-    print("--- Pull Changes ---"); print(f"⏳ Attempting to pull changes for remote 'origin' (default)...")
-    stdout, stderr, code = utils.run_command(["git", "pull"], cwd=state.current_repo_path, capture_output=True)
+    print("--- Pull Changes ---")
+    if utils.has_submodules(state.current_repo_path) and inquirer.confirm(
+            message=f"Also update submodules ({config.SUBMODULE_JOBS} in parallel)?", default=True).execute():
+        _pull_with_submodules(state.current_repo_path); return
+    print(f"⏳ Attempting to pull changes for remote 'origin' (default)...")
+    with background_fetch.worker.network_lock():
+        stdout, stderr, code = utils.run_command(["git", "pull"], cwd=state.current_repo_path, capture_output=True)
     if code == 0: print("✅ Changes pulled successfully."); print(f"   Output:\n{stdout}" if stdout else "")
     else: print(f"❌ Error pulling changes:"); print(f"   Error Output:\n{stderr}" if stderr else ""); print(f"   Standard Output:\n{stdout}" if stdout else "")
+def optimize_repository():
+    """Measures status/log latency, runs git maintenance and tuning, then reports the speedup."""
+    if not state.current_repo_path: print("⚠️ No repository selected."); return
+    repo_path = state.current_repo_path
+    print(f"--- Optimize Repository: {os.path.basename(repo_path)} ---")
+    print("⏱️ Measuring current performance...")
+    before, before_objects = repo_maintenance.measure_latency(repo_path), repo_maintenance.object_stats(repo_path)
+
+    print("🔧 Running maintenance and tuning steps...")
+    def on_step(label, ok, seconds, detail):
+        print(f"   {'✅' if ok else '❌'} {label:<32} {seconds:6.1f}s" + (f"  ({detail})" if detail else ""))
+    repo_maintenance.optimize(repo_path, on_step)
+    fs_watcher.status_cache.invalidate()
+
+    print("⏱️ Measuring again...")
+    after, after_objects = repo_maintenance.measure_latency(repo_path), repo_maintenance.object_stats(repo_path)
+    print("\n--- Results ---")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] > 0 else float("inf")
+        print(f"  {name:<8} {before[name] * 1000:8.1f} ms → {after[name] * 1000:8.1f} ms   ({speedup:.2f}x)")
+    print(f"  loose objects: {before_objects.get('count', 'N/A')} → {after_objects.get('count', 'N/A')}"
+          f" | packs: {before_objects.get('packs', 'N/A')} → {after_objects.get('packs', 'N/A')}")
+
+    known = [p for p in dict.fromkeys([repo_path] + utils.known_repositories())]
+    if inquirer.confirm(message=f"Schedule regular background maintenance for all {len(known)} known repositories?", default=False).execute():
+        utils.clear_screen(); print("--- Schedule Maintenance ---")
+        for path, (ok, err) in repo_maintenance.schedule_maintenance(known).items():
+            print(f"  {'✅' if ok else '❌'} {path}" + (f"  ({err})" if not ok and err else ""))
+
+def view_repository_stats():
+    """Shows churn, contributor and hotspot statistics, processing only commits added since the last view."""
+    if not state.current_repo_path: print("⚠️ No repository selected."); return
+    repo_path = state.current_repo_path
+    print(f"--- Repository Statistics: {os.path.basename(repo_path)} ---")
+    started = time.perf_counter()
+    stats, new_commits, incremental = repo_stats.compute(repo_path, on_progress=lambda n: print(f"   ⏳ {n} commits processed...", end="\r"))
+    if not stats["commits"]: print("ℹ️ No commits yet."); return
+    mode = ("cached" if not new_commits else "incremental update") if incremental else "full pass"
+    print(f"📈 {stats['commits']} commits | +{stats['added']} / -{stats['deleted']} lines"
+          f"  ({new_commits} new commits, {mode}, {time.perf_counter() - started:.2f}s)")
+
+    print("\n👥 Top contributors:")
+    top = repo_stats.top_authors(stats, config.STATS_TOP_N)
+    for author, (commits, added, deleted) in top:
+        print(f"  {commits:>7} commits  +{added:<9} -{deleted:<9} {author}")
+    print("\n🔥 Hotspots (most frequently changed files):")
+    for path, (changes, added, deleted) in repo_stats.hotspots(stats, config.STATS_TOP_N):
+        print(f"  {changes:>7} changes  +{added:<9} -{deleted:<9} {path}")
+
+    months = sorted(m for m in stats["monthly"] if m != "unknown")[-config.STATS_MONTHS:]
+    if months:
+        print(f"\n📅 Lines added/removed per month (top {min(5, len(top))} contributors):")
+        for author, _ in top[:5]:
+            print(f"  {author}")
+            for month in months:
+                added, deleted = stats["monthly"][month].get(author, [0, 0])
+                if added or deleted: print(f"     {month}  +{added:<9} -{deleted}")
+
+def _switch_to_worktree(path):
+    _activate_repository(path)
+    print(f"✅ Switched to worktree: {path}")
+    print("   ℹ️ Build caches in each worktree are kept, so switching back is instant.")
+
+def manage_branches():
+    """Lists branches via for-each-ref and opens the chosen one in a reusable managed worktree."""
+    if not state.current_repo_path: print("⚠️ No repository selected."); return
+    removed = worktrees.prune_idle(state.current_repo_path, keep_path=state.current_repo_path)
+    if removed: print(f"🧹 Pruned {len(removed)} idle worktree(s).")
+    branches = worktrees.list_branches(state.current_repo_path)
+    current_path = os.path.realpath(state.current_repo_path)
+    choices = []
+    for branch in branches:
+        marker = "●" if branch["worktree"] and os.path.realpath(branch["worktree"]) == current_path else ("◐" if branch["worktree"] else " ")
+        kind = "remote" if branch["remote"] else "local"
+        choices.append(Choice((branch["name"], branch["remote"]), name=f"{marker} {branch['name']:<35} {kind:<6} {branch['commit']}  {branch['date']:<16} {branch['subject'][:40]}"))
+    choices.append(Choice("NEW_BRANCH", name="➕ [Create New Branch in Worktree]"))
+    choices.append(Choice(None, name="🔙 [Back]"))
+    print("--- Branches (● active here, ◐ open in another worktree) ---")
+    selected = inquirer.select(message="Select a branch to switch to:", choices=choices, pointer="❯ ", qmark="🌿", cycle=True).execute()
+    utils.clear_screen()
+    if selected is None: return
+    if selected == "NEW_BRANCH":
+        new_branch = inquirer.text(
+            message="New branch name:", validate=lambda n: len(n) > 0 and " " not in n, invalid_message="Invalid branch name."
+        ).execute()
+        if not new_branch: print("Branch creation cancelled."); return
+        start_point = inquirer.text(message="Start from:", default="HEAD").execute() or "HEAD"
+        utils.clear_screen()
+        print(f"⏳ Creating branch '{new_branch}' from '{start_point}' in a new worktree...")
+        path, err = worktrees.create_branch(state.current_repo_path, new_branch, start_point)
+    else:
+        branch_name, is_remote = selected
+        print(f"⏳ Opening '{branch_name}'...")
+        path, err = worktrees.open_branch(state.current_repo_path, branch_name, is_remote)
+    if path: _switch_to_worktree(path)
+    else: print(f"❌ Could not open worktree: {err}")
+
+def browse_commit_log():
+    """Pages through `git log` as it streams, with jump-to-commit and path filters."""
+    if not state.current_repo_path: print("⚠️ No repository selected."); return
+    repo_path = state.current_repo_path
+    if config.LOG_WRITE_COMMIT_GRAPH and history.ensure_commit_graph_async(repo_path):
+        print("ℹ️ Writing a commit-graph in the background to speed up history queries...")
+    start_rev, path_filter = None, None
+    while True:
+        stream = history.CommitLogStream(repo_path, start_rev, path_filter)
+        pages, page_index, restart = [stream.next_page(config.LOG_PAGE_SIZE)], 0, False
+        try:
+            while not restart:
+                page = pages[page_index]
+                utils.clear_screen()
+                scope = f"from {start_rev[:12]}" if start_rev else "from HEAD"
+                if path_filter: scope += f", touching '{path_filter}'"
+                print(f"--- Commit History ({scope}) - page {page_index + 1} ---")
+                if not page: print("ℹ️ No commits found.")
+                choices = [Choice(c["hash"], name=f"{c['short_hash']}  {c['date']}  {c['author'][:18]:<18}  {c['subject'][:70]}") for c in page]
+                has_next = page_index + 1 < len(pages) or not stream.exhausted
+                if has_next: choices.append(Choice("NEXT_PAGE", name="➡️ [Next Page]"))
+                if page_index > 0: choices.append(Choice("PREV_PAGE", name="⬅️ [Previous Page]"))
+                choices.append(Choice("JUMP", name="🎯 [Jump to Commit]"))
+                choices.append(Choice("FILTER", name="🗂️ [Filter by Path]"))
+                if start_rev or path_filter: choices.append(Choice("RESET", name="♻️ [Clear Jump/Filter]"))
+                choices.append(Choice(None, name="🔙 [Back]"))
+                selected = inquirer.select(message="Select a commit to view or an action:", choices=choices, pointer="❯ ", qmark="📜", cycle=True).execute()
+                if selected is None: return
+                if selected == "NEXT_PAGE":
+                    if page_index + 1 == len(pages):
+                        next_page = stream.next_page(config.LOG_PAGE_SIZE)
+                        if not next_page: continue # History ended exactly on a page boundary
+                        pages.append(next_page)
+                    page_index += 1
+                elif selected == "PREV_PAGE": page_index -= 1
+                elif selected == "JUMP":
+                    rev = inquirer.text(message="Commit, branch or tag to start from:").execute()
+                    resolved = history.resolve_commit(repo_path, rev) if rev else None
+                    if resolved: start_rev, restart = resolved, True
+                    elif rev: print(f"❌ '{rev}' does not name a commit."); inquirer.text(message="Press Enter to continue...").execute()
+                elif selected == "FILTER":
+                    path_input = inquirer.text(message="Show only commits touching path (relative to repo root):", default=path_filter or "").execute()
+                    path_filter, restart = (path_input or None), True
+                elif selected == "RESET": start_rev, path_filter, restart = None, None, True
+                else:
+                    utils.page_command_output(["git", "show", "--stat", "--patch", "--color=always", selected], cwd=repo_path)
+        finally:
+            stream.close()
+
+def search_in_files(current_directory_in_repo="."):
+    """Searches file contents, printing matches as they stream in, then opens a chosen match in the editor."""
+    repo_path = state.current_repo_path
+    utils.clear_screen()
+    scope = "whole repository" if current_directory_in_repo == "." else current_directory_in_repo
+    print(f"--- Search in Files ({scope}) ---")
+    pattern = inquirer.text(message="Search for:").execute()
+    if not pattern: utils.clear_screen(); print("Search cancelled."); return
+    use_regex = inquirer.confirm(message="Treat it as a regular expression (Perl syntax)?", default=False).execute()
+    ignore_case = inquirer.confirm(message="Ignore case?", default=False).execute()
+    utils.clear_screen()
+    print(f"🔎 Searching for '{pattern}' (Ctrl+C to stop early)...")
+    matches = []
+    results = content_search.search(repo_path, pattern, fixed=not use_regex, ignore_case=ignore_case, subdir=current_directory_in_repo)
+    try:
+        for match in results:
+            matches.append(match)
+            print(f"  {len(matches):>4}. {match[0]}:{match[1]}: {match[2].strip()[:100]}")
+            if len(matches) >= config.SEARCH_MAX_RESULTS:
+                print(f"ℹ️ Stopped after {config.SEARCH_MAX_RESULTS} matches."); break
+    except KeyboardInterrupt:
+        print("ℹ️ Search stopped.")
+    except re.error as e:
+        print(f"❌ Invalid regular expression: {e}"); return
+    finally:
+        results.close()
+    if not matches: print("ℹ️ No matches found."); inquirer.text(message="Press Enter to continue...").execute(); return
+    choices = [Choice(i, name=f"{path}:{line_no}: {text.strip()[:80]}") for i, (path, line_no, text) in enumerate(matches)]
+    choices.append(Choice(None, name="🔙 [Back to File List]"))
+    while True:
+        selected = inquirer.select(message=f"{len(matches)} match(es). Open one in the editor:", choices=choices, pointer="❯ ", qmark="🔎", cycle=True).execute()
+        if selected is None: return
+        path, line_no, _ = matches[selected]
+        utils.clear_screen()
+        utils.select_editor_and_edit(os.path.join(repo_path, path), line=line_no)
+
+def view_blame(file_abs_path):
+    """Annotates a file with `git blame --incremental` as results arrive; results are cached per (file, commit)."""
+    repo_path = state.current_repo_path
+    rel_path = os.path.relpath(file_abs_path, repo_path).replace(os.sep, "/")
+    commit = history.resolve_commit(repo_path, "HEAD")
+    if not commit: print("ℹ️ The repository has no commits yet."); return
+    file_lines = blame.blob_lines(repo_path, rel_path, commit)
+    if file_lines is None: print(f"ℹ️ '{rel_path}' is not part of the last commit (new or untracked file)."); return
+    cached = blame.load_cached(repo_path, rel_path, commit)
+    if cached:
+        groups, commits = cached["groups"], cached["commits"]
+        print(f"⚡ Using cached blame for '{rel_path}' at {commit[:8]}.")
+    else:
+        groups, commits, annotated = [], {}, 0
+        print(f"--- Blame: {rel_path} @ {commit[:8]} (lines are annotated as results arrive) ---")
+        try:
+            for first_line, count, sha, info in blame.iter_incremental_blame(repo_path, rel_path, commit):
+                groups.append([first_line, count, sha]); commits[sha] = info
+                annotated += count
+                for n in range(first_line, min(first_line + count, len(file_lines) + 1)):
+                    print(f"{sha[:8]} {info['author'][:16]:<16} {n:>5} | {file_lines[n - 1]}")
+        except KeyboardInterrupt:
+            print(f"ℹ️ Blame stopped after {annotated} of {len(file_lines)} lines."); return
+        print(f"✅ Annotated {annotated} of {len(file_lines)} lines.")
+        blame.store(repo_path, rel_path, commit, groups, commits)
+    if inquirer.confirm(message="View the annotated file in line order?", default=True).execute():
+        utils.page_lines(blame.annotated_lines(file_lines, groups, commits))
+
 def modify_file_or_navigate(current_directory_in_repo="."):
     """
     Allows navigating directories within the repo, viewing file content,
@@ -473,6 +1109,7 @@ def modify_file_or_navigate(current_directory_in_repo="."):
             choices.append(Choice(value=item_name, name=f"📄 {item_name}"))
     
     choices.append(Choice(value="NEW_FILE_HERE", name="➕ [Create New File Here]"))
+    choices.append(Choice(value="SEARCH_IN_FILES", name="🔎 [Search in Files]"))
     choices.append(Choice(value="BACK_TO_LOCAL_MENU", name="🔙 [Back to Local Repo Menu]"))
 
     if not choices:
@@ -501,6 +1138,10 @@ def modify_file_or_navigate(current_directory_in_repo="."):
              parent_dir_in_repo = "."
         modify_file_or_navigate(parent_dir_in_repo)
 
+    elif selected_item_name == "SEARCH_IN_FILES":
+        search_in_files(current_directory_in_repo)
+        modify_file_or_navigate(current_directory_in_repo)
+
     elif selected_item_name == "NEW_FILE_HERE":
         utils.clear_screen()
         print(f"--- Create New File in: {display_path} ---")
@@ -544,6 +1185,7 @@ def modify_file_or_navigate(current_directory_in_repo="."):
                 choices=[
                     Choice("edit", name="✏️ Edit File"),
                     Choice("view", name="👁️ View File Content (in terminal)"),
+                    Choice("blame", name="🕵️ Blame (who last changed each line)"),
                     Choice("back", name="↩️ Go Back to File List"),
                 ],
                 pointer="❯ ",
@@ -559,6 +1201,11 @@ def modify_file_or_navigate(current_directory_in_repo="."):
                 utils.view_file_content_in_terminal(selected_item_abs_path)
                 inquirer.text(message="Press Enter to return to file actions...").execute()
                 modify_file_or_navigate(current_directory_in_repo)
+            elif file_action == "blame":
+                utils.clear_screen()
+                view_blame(selected_item_abs_path)
+                inquirer.text(message="Press Enter to return to file list...").execute()
+                modify_file_or_navigate(current_directory_in_repo)
             elif file_action == "back":
                 modify_file_or_navigate(current_directory_in_repo)
         else:
@@ -627,6 +1274,12 @@ def push_existing_project_to_new_repo():
             _, _, head_c = utils.run_command(["git", "rev-parse", "--verify", "HEAD"], cwd=project_path, capture_output=True)
             if head_c != 0: initial_commit_needed = True; print("ℹ️ No commits yet. Will create initial commit.")
     
+    exclude = []
+    if initial_commit_needed: # Scan before anything is created remotely, so cancelling leaves no empty GitHub repo behind
+        review = _review_prestage_scan(project_path)
+        if review is None: utils.clear_screen(); print("Operation cancelled by user."); return
+        exclude = [f":(exclude,literal){p}" for p in review[0]]
+
     print(f"⏳ Creating GitHub repository '{repo_name}' and setting up remote for '{project_path}'...")
     gh_create_cmd = [config.GH_COMMAND, "repo", "create", repo_name, f"--{visibility}", "--source", project_path]
     if description: gh_create_cmd.extend(["--description", description])
@@ -655,8 +1308,9 @@ def push_existing_project_to_new_repo():
     else: print(f"Unexpected issue creating repo. Code: {code_create}\nError: {stderr_create}\nOutput: {stdout_create}"); return
 
     if initial_commit_needed:
-        utils.clear_screen(); print("--- Preparing Local Commit ---"); print("📂 Staging all files (git add .)...")
-        add_out, add_err, add_code = utils.run_command(["git", "add", "."], cwd=project_path, capture_output=True)
+        utils.clear_screen(); print("--- Preparing Local Commit ---")
+        print("📂 Staging all files (git add .)...")
+        add_out, add_err, add_code = utils.run_command(["git", "add", "--", "."] + exclude, cwd=project_path, capture_output=True)
         if add_code != 0: print(f"❌ Failed to stage files: {add_err or add_out}"); return
         _, _, staged_check_code = utils.run_command(["git", "diff", "--staged", "--quiet"], cwd=project_path, capture_output=True)
         if staged_check_code == 0: print("ℹ️ No new changes staged."); initial_commit_needed = False
@@ -687,4 +1341,4 @@ def push_existing_project_to_new_repo():
         if "Everything up-to-date" in msg_push: print("   (This means no new local commits to send.)")
         else: print("   Troubleshooting: check branch, remote, or try manual push."); return
     else: print(f"✅ Pushed '{project_path}' to '{repo_name}'.\n   Output: {push_out}" if push_out else "")
-    state.current_repo_path = project_path; print(f"ℹ️ Active repo set to: {project_path}")
+    _activate_repository(project_path); print(f"ℹ️ Active repo set to: {project_path}")
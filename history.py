@@ -0,0 +1,73 @@
+import os
+import itertools
+import subprocess
+import threading
+import utils
+
+# Fields are separated by the ASCII unit separator; commits by NUL (git log -z).
+LOG_FORMAT = "%H%x1f%h%x1f%an%x1f%ad%x1f%s"
+_LOG_FIELDS = ("hash", "short_hash", "author", "date", "subject")
+
+class CommitLogStream:
+    """
+    Streams `git log` records on demand. git blocks on the pipe while pages are not
+    being read, so only the pages actually requested are ever produced or held.
+    """
+    def __init__(self, repo_path, start_rev=None, path_filter=None):
+        command = ["git", "log", "-z", f"--format={LOG_FORMAT}", "--date=short"]
+        if start_rev: command.append(start_rev)
+        command.append("--")
+        if path_filter: command.append(path_filter)
+        self._process = subprocess.Popen(command, cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._records = utils.iter_nul_records(self._process.stdout)
+        self.exhausted = False
+
+    def next_page(self, page_size):
+        """Returns up to page_size commit dicts; sets `exhausted` once git has no more."""
+        page = []
+        for record in itertools.islice(self._records, page_size):
+            fields = record.lstrip("\n").split("\x1f")
+            if len(fields) == len(_LOG_FIELDS):
+                page.append(dict(zip(_LOG_FIELDS, fields)))
+        if len(page) < page_size:
+            self.exhausted = True
+        return page
+
+    def close(self):
+        if self._process.poll() is None:
+            self._process.terminate()
+        self._process.stdout.close()
+        self._process.wait()
+
+def _git_path(repo_path, relative):
+    stdout, _, code = utils.run_command(["git", "rev-parse", "--git-path", relative], cwd=repo_path, capture_output=True)
+    if code != 0 or not stdout: return None
+    return os.path.join(repo_path, stdout) if not os.path.isabs(stdout) else stdout
+
+def has_commit_graph(repo_path):
+    for relative in ("objects/info/commit-graph", "objects/info/commit-graphs"):
+        path = _git_path(repo_path, relative)
+        if path and os.path.exists(path):
+            return True
+    return False
+
+def ensure_commit_graph_async(repo_path):
+    """
+    Writes a commit-graph with changed-path Bloom filters in the background if the
+    repository has none, which speeds up ancestry walks and path-filtered logs.
+    Returns the worker thread, or None if nothing needed doing.
+    """
+    if has_commit_graph(repo_path): return None
+    thread = threading.Thread(
+        target=utils.run_command,
+        args=(["git", "commit-graph", "write", "--reachable", "--changed-paths"],),
+        kwargs={"cwd": repo_path, "capture_output": True},
+        name="easygit-commit-graph", daemon=True
+    )
+    thread.start()
+    return thread
+
+def resolve_commit(repo_path, rev):
+    """Returns the full hash for `rev`, or None if it does not name a commit."""
+    stdout, _, code = utils.run_command(["git", "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"], cwd=repo_path, capture_output=True)
+    return stdout if code == 0 and stdout else None
@@ -8,6 +8,7 @@ try:
     import utils
     import ui_menus
     import state
+    import background_fetch
 except ImportError:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     if current_dir not in sys.path:
@@ -16,6 +17,7 @@ except ImportError:
     import utils
     import ui_menus
     import state
+    import background_fetch
 
 
 def initialize_app():
@@ -51,7 +53,10 @@ def initialize_app():
 
 if __name__ == "__main__":
     if initialize_app():
+        if config.PREFETCH_ENABLED:
+            background_fetch.worker.start()
         ui_menus.display_main_menu()
+        background_fetch.worker.stop()
     else:
         print("\nApplication initialization failed. Exiting.")
         input("Press Enter to exit.")
\ No newline at end of file
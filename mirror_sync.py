@@ -0,0 +1,101 @@
+import os
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import utils
+import config
+
+MIRROR_STATE_CACHE = "mirror_sync_state"
+_PARTIAL_SUFFIX = ".partial"
+
+def mirror_path(root_dir, name_with_owner, mode):
+    owner, _, name = name_with_owner.partition("/")
+    return os.path.join(root_dir, owner, f"{name}.git" if mode == "bare" else name)
+
+def _repo_size_kib(path):
+    stdout, _, code = utils.run_command(["git", "count-objects", "-v"], cwd=path, capture_output=True)
+    if code != 0 or not stdout: return 0
+    sizes = dict(line.split(": ", 1) for line in stdout.splitlines() if ": " in line)
+    return int(sizes.get("size", 0)) + int(sizes.get("size-pack", 0))
+
+def sync_one(name_with_owner, root_dir, mode):
+    """
+    Clones a missing mirror or fetches an existing one. Clones go to a '.partial'
+    directory first and are renamed only when complete, so an interrupted clone is
+    retried cleanly. Returns a result dict with action, ok, seconds, kib and error.
+    """
+    target = mirror_path(root_dir, name_with_owner, mode)
+    started = time.perf_counter()
+    env = utils.NO_PROMPT_ENV
+    if utils.is_git_repository(target) or (mode == "bare" and os.path.isfile(os.path.join(target, "HEAD"))):
+        action, before = "fetch", _repo_size_kib(target)
+        command = ["git", "remote", "update", "--prune"] if mode == "bare" else ["git", "fetch", "--all", "--prune"]
+        _, stderr, code = utils.run_command(command, cwd=target, capture_output=True, env=env)
+    elif os.path.lexists(target):
+        action, before, code = "clone", 0, 1
+        stderr = f"'{target}' already exists and is not a {'bare ' if mode == 'bare' else ''}repository; move it away and sync again"
+    else:
+        action, before = "clone", 0
+        partial = target + _PARTIAL_SUFFIX
+        command = [config.GH_COMMAND, "repo", "clone", name_with_owner, partial]
+        if mode == "bare": command.extend(["--", "--mirror"])
+        try:
+            shutil.rmtree(partial, ignore_errors=True)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _, stderr, code = utils.run_command(command, capture_output=True, env=env)
+            if code == 0: os.replace(partial, target)
+        except OSError as e: # e.g. target created meanwhile, or no permission on the mirror root
+            stderr, code = str(e), 1
+        if code != 0: shutil.rmtree(partial, ignore_errors=True)
+    kib = max(0, _repo_size_kib(target) - before) if code == 0 else 0
+    return {"repo": name_with_owner, "action": action, "ok": code == 0,
+            "seconds": time.perf_counter() - started, "kib": kib, "error": stderr if code != 0 else ""}
+
+def pending_from_previous_run(root_dir, mode):
+    """Returns repos left unfinished by an interrupted sync of the same root and mode, or []."""
+    previous = utils.load_json_cache(MIRROR_STATE_CACHE).get(root_dir)
+    if not previous or previous.get("mode") != mode: return []
+    return previous.get("pending", [])
+
+def sync_mirrors(repo_names, root_dir, mode="bare", workers=None, on_result=None):
+    """
+    Syncs all given repositories through a bounded worker pool. Progress is saved
+    after every repository, so an interrupted run can be resumed with the
+    still-pending names. Returns (results, elapsed_seconds).
+    """
+    workers = workers or config.MIRROR_SYNC_WORKERS
+    state_lock = threading.Lock()
+    sync_state = utils.load_json_cache(MIRROR_STATE_CACHE)
+    run_state = sync_state.setdefault(root_dir, {})
+    run_state.update({"mode": mode, "pending": list(repo_names)})
+    run_state.setdefault("repos", {})
+    utils.save_json_cache(MIRROR_STATE_CACHE, sync_state)
+
+    results = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(sync_one, name, root_dir, mode) for name in repo_names]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            with state_lock:
+                if result["ok"]: run_state["pending"].remove(result["repo"])
+                run_state["repos"][result["repo"]] = {
+                    "ok": result["ok"], "action": result["action"], "seconds": round(result["seconds"], 2), "synced_at": time.time()
+                }
+                utils.save_json_cache(MIRROR_STATE_CACHE, sync_state)
+            if on_result: on_result(result)
+    return results, time.perf_counter() - started
+
+def throughput_summary(results, elapsed):
+    """Aggregate numbers for the end-of-sync report."""
+    ok = [r for r in results if r["ok"]]
+    total_kib = sum(r["kib"] for r in ok)
+    return {
+        "repos": len(results), "succeeded": len(ok), "failed": len(results) - len(ok),
+        "cloned": sum(1 for r in ok if r["action"] == "clone"), "fetched": sum(1 for r in ok if r["action"] == "fetch"),
+        "elapsed": elapsed, "mib": total_kib / 1024,
+        "repos_per_min": len(ok) / elapsed * 60 if elapsed > 0 else 0.0,
+        "mib_per_s": total_kib / 1024 / elapsed if elapsed > 0 else 0.0,
+    }
@@ -0,0 +1,116 @@
+import os
+import time
+import json
+import shutil
+import tempfile
+import subprocess
+import hashlib
+import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import utils
+import config
+
+CHECK_CACHE_NAME = "precommit_check_cache" # {repo_path: {"<check key>:<path>:<blob>": True}}
+_CHECK_CACHE_LIMIT = 50000 # Per repository; oldest entries are dropped beyond this many
+
+def staged_blobs(repo_path):
+    """Returns {path: staged blob hash} for added/copied/modified/renamed staged files."""
+    stdout, _, code = utils.run_command(
+        ["git", "diff", "--staged", "--raw", "-z", "--no-abbrev", "--no-renames", "--diff-filter=ACMR"],
+        cwd=repo_path, capture_output=True
+    )
+    if code != 0 or not stdout: return {}
+    tokens = stdout.split("\0")
+    blobs = {}
+    for meta, path in zip(tokens[0::2], tokens[1::2]):
+        fields = meta.split()
+        if len(fields) >= 4 and path: blobs[path] = fields[3]
+    return blobs
+
+def export_staged(repo_path, paths, target_dir):
+    """
+    Writes the staged (index) content of `paths` into target_dir, along with the other indexed
+    files of their directories and every parent directory, where linters look for their
+    config files. Returns True on success.
+    """
+    stdout, _, code = utils.run_command(["git", "ls-files", "-z", "--cached"], cwd=repo_path, capture_output=True)
+    if code != 0: return False
+    directories = {""}
+    for path in paths:
+        parent = os.path.dirname(path)
+        while parent and parent not in directories:
+            directories.add(parent); parent = os.path.dirname(parent)
+    wanted = set(paths) | {p for p in stdout.split("\0") if p and os.path.dirname(p) in directories}
+    process = subprocess.run(
+        ["git", "checkout-index", "-z", "--stdin", f"--prefix={os.path.join(target_dir, '')}"],
+        cwd=repo_path, input="\0".join(sorted(wanted)).encode('utf-8'), capture_output=True
+    )
+    return process.returncode == 0
+
+def _check_key(check):
+    """Cache namespace for a check; changing its command invalidates its cached results."""
+    return hashlib.sha1(json.dumps([check["name"], check["command"]]).encode()).hexdigest()[:12]
+
+def run_checks(repo_path, checks=None, on_batch=None):
+    """
+    Runs the configured checks in parallel batches over the staged content of the staged
+    files, exported to a temporary directory so unstaged edits never affect the result.
+    Files whose staged blob already passed a check at the same path in this repository
+    are skipped. Returns a list of per-check dicts with name, ok, seconds, checked,
+    cached and failures [(files, output)].
+    """
+    checks = config.PRECOMMIT_CHECKS if checks is None else checks
+    blobs = staged_blobs(repo_path)
+    if not checks or not blobs: return []
+    cache = utils.load_json_cache(CHECK_CACHE_NAME)
+    # Namespaced per repository and keyed by path too: lint configs differ between repos and directories.
+    repo_cache = cache.setdefault(repo_path, {})
+    cache_lock = threading.Lock()
+
+    reports, jobs = [], []
+    for check in checks:
+        key = _check_key(check)
+        patterns = check.get("patterns") or ["*"]
+        matching = [p for p in blobs if any(fnmatch.fnmatch(p, pat) for pat in patterns)]
+        to_check = [p for p in matching if repo_cache.get(f"{key}:{p}:{blobs[p]}") is None]
+        report = {"name": check["name"], "ok": True, "seconds": 0.0, "checked": len(to_check),
+                  "cached": len(matching) - len(to_check), "failures": []}
+        reports.append(report)
+        batch_size = check.get("batch_size") or config.PRECOMMIT_BATCH_SIZE
+        for i in range(0, len(to_check), batch_size):
+            jobs.append((check, key, report, to_check[i:i + batch_size]))
+
+    if not jobs: return reports
+    staged_dir = tempfile.mkdtemp(prefix="easygit-precommit-")
+    if not export_staged(repo_path, sorted({path for job in jobs for path in job[3]}), staged_dir):
+        shutil.rmtree(staged_dir, ignore_errors=True)
+        for report in reports:
+            if report["checked"]: report["ok"] = False; report["failures"].append(([], "Could not export the staged files."))
+        return reports
+
+    def run_batch(job):
+        check, key, report, files = job
+        started = time.perf_counter()
+        stdout, stderr, code = utils.run_command(list(check["command"]) + files, cwd=staged_dir, capture_output=True)
+        elapsed = time.perf_counter() - started
+        with cache_lock:
+            report["seconds"] += elapsed
+            if code == 0:
+                for path in files:
+                    repo_cache[f"{key}:{path}:{blobs[path]}"] = True
+            else:
+                report["ok"] = False
+                report["failures"].append((files, "\n".join(part for part in (stdout, stderr) if part)))
+        if on_batch: on_batch(check["name"], files, code == 0, elapsed)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, config.PRECOMMIT_WORKERS)) as pool:
+            list(pool.map(run_batch, jobs))
+    finally:
+        shutil.rmtree(staged_dir, ignore_errors=True)
+
+    if len(repo_cache) > _CHECK_CACHE_LIMIT:
+        cache[repo_path] = dict(list(repo_cache.items())[-_CHECK_CACHE_LIMIT:])
+    utils.save_json_cache(CHECK_CACHE_NAME, cache)
+    return reports
@@ -0,0 +1,79 @@
+import time
+import statistics
+import utils
+import config
+import fs_watcher
+
+# Operations timed before and after optimizing; they dominate day-to-day latency.
+_MEASUREMENTS = {
+    "status": ["git", "--no-optional-locks", "status", "--porcelain"],
+    "log": ["git", "log", "-n", "1000", "--format=%H"],
+}
+
+def measure_latency(repo_path, runs=None):
+    """Returns {operation: median seconds} for the operations in _MEASUREMENTS."""
+    runs = runs or config.MAINTENANCE_MEASURE_RUNS
+    results = {}
+    for name, command in _MEASUREMENTS.items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            utils.run_command(command, cwd=repo_path, capture_output=True)
+            timings.append(time.perf_counter() - started)
+        results[name] = statistics.median(timings)
+    return results
+
+def object_stats(repo_path):
+    """Parses `git count-objects -v` into a dict of ints (count, size-pack, packs, ...)."""
+    stdout, _, code = utils.run_command(["git", "count-objects", "-v"], cwd=repo_path, capture_output=True)
+    stats = {}
+    if code != 0 or not stdout: return stats
+    for line in stdout.splitlines():
+        key, _, value = line.partition(":")
+        if value.strip().isdigit(): stats[key.strip()] = int(value.strip())
+    return stats
+
+def optimization_steps():
+    """Returns (label, command or callable) pairs in the order they should run."""
+    steps = [(f"maintenance: {task}", ["git", "maintenance", "run", f"--task={task}"]) for task in config.MAINTENANCE_TASKS]
+    if config.MAINTENANCE_WRITE_MULTI_PACK_INDEX:
+        steps.append(("multi-pack-index", ["git", "multi-pack-index", "write"]))
+    if config.MAINTENANCE_INDEX_VERSION_4:
+        steps.append(("index version 4", ["git", "update-index", "--index-version", "4"]))
+    steps.append(("untracked cache / fsmonitor", fs_watcher.enable_git_status_caches))
+    return steps
+
+def optimize(repo_path, on_step=None):
+    """
+    Runs every optimization step, calling on_step(label, ok, seconds, detail) after each.
+    Returns a list of those tuples.
+    """
+    results = []
+    for label, step in optimization_steps():
+        started = time.perf_counter()
+        if callable(step):
+            applied = step(repo_path)
+            ok, detail = True, ", ".join(applied) if applied else "nothing applicable"
+        else:
+            _, stderr, code = utils.run_command(step, cwd=repo_path, capture_output=True)
+            ok, detail = code == 0, stderr
+        result = (label, ok, time.perf_counter() - started, detail)
+        results.append(result)
+        if on_step: on_step(*result)
+    return results
+
+def schedule_maintenance(repo_paths):
+    """
+    Registers each repository with `git maintenance` and starts git's own background
+    scheduler (cron/systemd/launchd/Task Scheduler). Returns {repo_path: (ok, error)}.
+    """
+    results = {}
+    for repo_path in repo_paths:
+        _, stderr, code = utils.run_command(["git", "maintenance", "register"], cwd=repo_path, capture_output=True)
+        results[repo_path] = (code == 0, stderr)
+    registered = [p for p, (ok, _) in results.items() if ok]
+    if registered:
+        _, stderr, code = utils.run_command(["git", "maintenance", "start"], cwd=registered[0], capture_output=True)
+        if code != 0:
+            for repo_path in registered: results[repo_path] = (False, stderr)
+    return results
@@ -0,0 +1,77 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import utils
+import config
+
+_REPO_FIELDS = """fragment RepoFields on Repository {
+  nameWithOwner
+  isArchived
+  diskUsage
+  defaultBranchRef { name }
+  primaryLanguage { name }
+  pullRequests(states: OPEN) { totalCount }
+  issues(states: OPEN) { totalCount }
+}"""
+
+def build_query(names_with_owner):
+    """
+    Builds one GraphQL query that looks up every repository under its own alias (r0, r1, ...).
+    Owners and names are passed as variables, so they never need escaping.
+    Returns (query, variables).
+    """
+    declarations, selections, variables = [], [], {}
+    for i, name_with_owner in enumerate(names_with_owner):
+        owner, _, name = name_with_owner.partition("/")
+        declarations.append(f"$o{i}: String!, $n{i}: String!")
+        selections.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}")
+        variables[f"o{i}"], variables[f"n{i}"] = owner, name
+    query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}\n" + _REPO_FIELDS
+    return query, variables
+
+def _flatten(node):
+    return {
+        "defaultBranch": (node.get("defaultBranchRef") or {}).get("name"),
+        "diskUsage": node.get("diskUsage"), # KiB
+        "primaryLanguage": (node.get("primaryLanguage") or {}).get("name"),
+        "openPullRequests": (node.get("pullRequests") or {}).get("totalCount"),
+        "openIssues": (node.get("issues") or {}).get("totalCount"),
+        "isArchived": node.get("isArchived"),
+    }
+
+def fetch_batch(names_with_owner):
+    """
+    Runs one aliased `gh api graphql` request for a batch of repositories.
+    Returns ({nameWithOwner: metadata}, error). Repositories GraphQL could not
+    resolve are left out, while the rest of the batch is still returned.
+    """
+    query, variables = build_query(names_with_owner)
+    command = [config.GH_COMMAND, "api", "graphql", "-f", f"query={query}"]
+    for key, value in variables.items():
+        command.extend(["-f", f"{key}={value}"])
+    stdout, stderr, code = utils.run_command(command, capture_output=True)
+    try:
+        data = (json.loads(stdout) if stdout else {}).get("data") or {}
+    except json.JSONDecodeError:
+        data = {}
+    metadata = {}
+    for i, name_with_owner in enumerate(names_with_owner):
+        node = data.get(f"r{i}")
+        if node: metadata[name_with_owner] = _flatten(node)
+    error = None if code == 0 else (stderr or f"exit code {code}")
+    return metadata, error
+
+def fetch_metadata(names_with_owner):
+    """
+    Fetches metadata for many repositories in chunks of config.REMOTE_METADATA_BATCH_SIZE,
+    with up to config.REMOTE_METADATA_WORKERS requests in flight.
+    Returns ({nameWithOwner: metadata}, [errors]).
+    """
+    size = max(1, config.REMOTE_METADATA_BATCH_SIZE)
+    batches = [names_with_owner[i:i + size] for i in range(0, len(names_with_owner), size)]
+    metadata, errors = {}, []
+    if not batches: return metadata, errors
+    with ThreadPoolExecutor(max_workers=max(1, min(config.REMOTE_METADATA_WORKERS, len(batches)))) as pool:
+        for batch_metadata, error in pool.map(fetch_batch, batches):
+            metadata.update(batch_metadata)
+            if error: errors.append(error)
+    return metadata, errors
@@ -0,0 +1,149 @@
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import subprocess
+import utils
+import config
+
+# Each commit starts with NUL so records can be split without ambiguity; numstat lines follow.
+_LOG_FORMAT = "%x00%H%x1f%an%x1f%at"
+
+def _empty_stats():
+    return {"commits": 0, "added": 0, "deleted": 0, "authors": {}, "files": {}, "monthly": {}}
+
+def _cache_name(repo_path):
+    return "repo_stats_" + hashlib.sha1(repo_path.encode('utf-8')).hexdigest()[:12]
+
+def _head(repo_path):
+    stdout, _, code = utils.run_command(["git", "rev-parse", "--verify", "--quiet", "HEAD"], cwd=repo_path, capture_output=True)
+    return stdout if code == 0 and stdout else None
+
+def _is_ancestor(repo_path, ancestor, descendant):
+    _, _, code = utils.run_command(["git", "merge-base", "--is-ancestor", ancestor, descendant], cwd=repo_path, capture_output=True)
+    return code == 0
+
+def accumulate(repo_path, stats, rev_range, on_progress=None):
+    """
+    Folds the commits in rev_range into stats with a single streaming pass over
+    `git log --numstat`. Returns the number of commits processed.
+    """
+    process = subprocess.Popen(
+        ["git", "-c", "core.quotePath=false", "log", "--numstat", "--no-renames", f"--format={_LOG_FORMAT}", rev_range, "--"],
+        cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    authors, files, monthly = stats["authors"], stats["files"], stats["monthly"]
+    processed = 0
+    try:
+        for record in utils.iter_nul_records(process.stdout):
+            header, _, body = record.partition("\n")
+            fields = header.split("\x1f")
+            if len(fields) != 3: continue
+            _, author, timestamp = fields
+            month = time.strftime("%Y-%m", time.gmtime(int(timestamp))) if timestamp.isdigit() else "unknown"
+            author_stats = authors.setdefault(author, [0, 0, 0]) # commits, added, deleted
+            month_stats = monthly.setdefault(month, {}).setdefault(author, [0, 0])
+            author_stats[0] += 1
+            for line in body.splitlines():
+                parts = line.split("\t", 2)
+                if len(parts) != 3: continue
+                added = int(parts[0]) if parts[0].isdigit() else 0 # '-' for binary files
+                deleted = int(parts[1]) if parts[1].isdigit() else 0
+                file_stats = files.setdefault(parts[2], [0, 0, 0]) # changes, added, deleted
+                file_stats[0] += 1; file_stats[1] += added; file_stats[2] += deleted
+                author_stats[1] += added; author_stats[2] += deleted
+                month_stats[0] += added; month_stats[1] += deleted
+                stats["added"] += added; stats["deleted"] += deleted
+            processed += 1
+            if on_progress and processed % 10000 == 0: on_progress(processed)
+    finally:
+        process.stdout.close()
+        process.wait()
+    stats["commits"] += processed
+    return processed
+
+def compute(repo_path, on_progress=None):
+    """
+    Returns (stats, new_commits, incremental). Aggregates are persisted with the last
+    processed commit, so later calls only walk commits added since then. A full
+    recompute happens only when that commit is no longer an ancestor of HEAD.
+    """
+    head = _head(repo_path)
+    if not head: return _empty_stats(), 0, False
+    cached = utils.load_json_cache(_cache_name(repo_path))
+    last = cached.get("head")
+    if last == head: return cached["stats"], 0, True
+    incremental = bool(last) and _is_ancestor(repo_path, last, head)
+    stats = cached["stats"] if incremental else _empty_stats()
+    new_commits = accumulate(repo_path, stats, f"{last}..{head}" if incremental else head, on_progress)
+    utils.save_json_cache(_cache_name(repo_path), {"repo": repo_path, "head": head, "stats": stats})
+    return stats, new_commits, incremental
+
+def top_authors(stats, limit=10):
+    return sorted(stats["authors"].items(), key=lambda item: item[1][0], reverse=True)[:limit]
+
+def hotspots(stats, limit=15):
+    return sorted(stats["files"].items(), key=lambda item: item[1][0], reverse=True)[:limit]
+
+def _write_synthetic_history(repo_path, first, last, file_count=2000, authors=25):
+    """
+    Appends commits first..last to refs/heads/main with `git fast-import`, each one
+    rewriting a file, so every commit carries real numstat lines.
+    """
+    importer = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=repo_path, stdin=subprocess.PIPE)
+    write = importer.stdin.write
+    start = 1_500_000_000
+    for n in range(first, last + 1):
+        author = f"Author {n % authors} <author{n % authors}@example.com> {start + n * 600} +0000"
+        message = f"Commit {n}".encode()
+        write(f"commit refs/heads/main\nmark :{n}\nauthor {author}\ncommitter {author}\ndata {len(message)}\n".encode() + message + b"\n")
+        if n > first: write(f"from :{n - 1}\n".encode())
+        elif n > 1: write(b"from refs/heads/main^0\n") # Continue the history imported by an earlier run
+        content = f"{n}\n".encode() * (1 + n % 5)
+        write(f"M 100644 inline src/file_{(n * 7919) % file_count}.txt\ndata {len(content)}\n".encode() + content + b"\n")
+    importer.stdin.close()
+    if importer.wait() != 0: raise RuntimeError("git fast-import failed")
+
+def benchmark(commit_count=500000, new_commits=1000, workdir=None):
+    """
+    Times a full stats pass over a synthetic history of commit_count commits, then
+    an incremental pass after new_commits more file-changing commits, and a no-op
+    cached pass. A temporary directory is removed afterwards unless workdir is given.
+    """
+    root = workdir or tempfile.mkdtemp(prefix="easygit-stats-bench-")
+    saved_home, config.EASYGIT_HOME = config.EASYGIT_HOME, os.path.join(root, "home")
+    repo_path = os.path.join(root, "repo")
+    try:
+        print(f"Building synthetic history of {commit_count} commits in {repo_path} ...")
+        started = time.perf_counter()
+        subprocess.run(["git", "init", "-q", repo_path], check=True)
+        _write_synthetic_history(repo_path, 1, commit_count)
+        subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=repo_path, check=True)
+        utils.run_command(["git", "commit-graph", "write", "--reachable"], cwd=repo_path, capture_output=True)
+        print(f"  built in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        stats, processed, _ = compute(repo_path)
+        full = time.perf_counter() - started
+        print(f"Full pass:        {processed:>8} commits in {full:8.2f}s ({processed / full:,.0f} commits/s)")
+
+        _write_synthetic_history(repo_path, commit_count + 1, commit_count + new_commits)
+        started = time.perf_counter()
+        stats, processed, incremental = compute(repo_path)
+        delta = time.perf_counter() - started
+        print(f"Incremental pass: {processed:>8} commits in {delta:8.2f}s (incremental={incremental})")
+
+        started = time.perf_counter()
+        compute(repo_path)
+        print(f"Cached pass:      {0:>8} commits in {time.perf_counter() - started:8.2f}s")
+        print(f"Totals: {stats['commits']} commits, {len(stats['authors'])} authors, {len(stats['files'])} files,"
+              f" +{stats['added']} / -{stats['deleted']} lines")
+        return full, delta
+    finally:
+        config.EASYGIT_HOME = saved_home
+        if not workdir: shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    import sys
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500000, int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
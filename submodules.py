@@ -0,0 +1,128 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import utils
+import config
+
+_STATUS_LINE = re.compile(r"^(?P<state>[ +U-]?)(?P<sha>[0-9a-f]{40,64}) (?P<path>.+?)(?: \([^)]*\))?$")
+_SUBMODULE_LINE = re.compile(r"^(?:Fetching submodule (?P<fetching>.+)|Submodule path '(?P<path>[^']+)': (?P<message>.+))$")
+
+def list_submodules(repo_path):
+    """
+    Lists all submodules (recursively) as dicts with 'path' (relative to repo_path),
+    'sha', 'state' and 'initialized'. State follows `git submodule status`: ' ' in sync,
+    '-' not initialized, '+' checked out commit differs from the recorded one, 'U' conflicts.
+    """
+    if not utils.has_submodules(repo_path): return []
+    stdout, _, code = utils.run_command(["git", "submodule", "status", "--recursive"], cwd=repo_path, capture_output=True)
+    if code != 0 or not stdout: return []
+    submodules = []
+    for line in stdout.splitlines():
+        match = _STATUS_LINE.match(line)
+        if not match: continue
+        state = match.group("state") or " " # run_command strips the leading space of the first line
+        submodules.append({"path": match.group("path"), "sha": match.group("sha"), "state": state, "initialized": state != "-"})
+    return submodules
+
+def _parse_porcelain_v2(output):
+    info = {"branch": None, "upstream": None, "ahead": 0, "behind": 0, "changed": 0, "untracked": 0, "conflicts": 0}
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            info["branch"] = None if head == "(detached)" else head
+        elif line.startswith("# branch.upstream "): info["upstream"] = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line[len("# branch.ab "):].split()
+            info["ahead"], info["behind"] = int(ahead), -int(behind)
+        elif line.startswith(("1 ", "2 ")): info["changed"] += 1
+        elif line.startswith("u "): info["conflicts"] += 1
+        elif line.startswith("? "): info["untracked"] += 1
+    return info
+
+def submodule_status(repo_path, submodule):
+    """Collects branch, ahead/behind, local changes and unpushed commit count for one submodule."""
+    sub_path = os.path.join(repo_path, submodule["path"])
+    result = dict(submodule, error=None, unpushed=0)
+    if not submodule["initialized"]: return result
+    stdout, stderr, code = utils.run_command(
+        ["git", "--no-optional-locks", "status", "--porcelain=v2", "--branch"], cwd=sub_path, capture_output=True
+    )
+    if code != 0:
+        result["error"] = stderr or f"exit code {code}"; return result
+    result.update(_parse_porcelain_v2(stdout))
+    if result["upstream"]:
+        result["unpushed"] = result["ahead"]
+    else: # No upstream (or detached HEAD): count commits no remote-tracking branch contains
+        count, _, code = utils.run_command(["git", "rev-list", "--count", "HEAD", "--not", "--remotes"], cwd=sub_path, capture_output=True)
+        result["unpushed"] = int(count) if code == 0 and count.isdigit() else 0
+    return result
+
+def status_summary(repo_path):
+    """Returns the status of every submodule, collected in parallel, in `git submodule status` order."""
+    submodules = list_submodules(repo_path)
+    if not submodules: return []
+    with ThreadPoolExecutor(max_workers=max(1, config.SUBMODULE_JOBS)) as pool:
+        return list(pool.map(lambda sub: submodule_status(repo_path, sub), submodules))
+
+def pull_recursive(repo_path, on_progress=None):
+    """
+    Pulls the superproject and updates all submodules, fetching and checking them out
+    config.SUBMODULE_JOBS at a time. on_progress(submodule_path, message) receives
+    per-submodule progress (submodule_path is None for superproject output).
+    Returns (ok, last_lines, updated) where updated maps path -> (old_sha, new_sha).
+    """
+    jobs = str(max(1, config.SUBMODULE_JOBS))
+    before = {sub["path"]: sub["sha"] for sub in list_submodules(repo_path)}
+
+    def on_line(line, is_progress):
+        if not on_progress or is_progress: return
+        match = _SUBMODULE_LINE.match(line)
+        if not match: on_progress(None, line)
+        elif match.group("fetching"): on_progress(match.group("fetching"), "fetching...")
+        else: on_progress(match.group("path"), match.group("message"))
+
+    for command in (["git", "pull", "--recurse-submodules", f"--jobs={jobs}"],
+                    ["git", "submodule", "update", "--init", "--recursive", f"--jobs={jobs}"]):
+        last_lines, code = utils.stream_command(command, cwd=repo_path, env=utils.NO_PROMPT_ENV, on_line=on_line)
+        if code != 0: return False, last_lines, {}
+
+    after = {sub["path"]: sub["sha"] for sub in list_submodules(repo_path)}
+    updated = {path: (before.get(path), sha) for path, sha in after.items() if before.get(path) != sha}
+    return True, [], updated
+
+def _push_submodule(repo_path, status, on_progress):
+    sub_path = os.path.join(repo_path, status["path"])
+    if not status["branch"]:
+        return status["path"], False, 0.0, "detached HEAD with unpushed commits; check out a branch in the submodule first"
+    if status["upstream"]:
+        command = ["git", "push", "--progress"]
+    else:
+        remotes, _, _ = utils.run_command(["git", "remote"], cwd=sub_path, capture_output=True)
+        if not remotes: return status["path"], False, 0.0, "no remote configured"
+        remote = "origin" if "origin" in remotes.split() else remotes.split()[0]
+        command = ["git", "push", "--progress", "-u", remote, status["branch"]]
+    on_line = (lambda line, is_progress: on_progress(status["path"], line)) if on_progress else None
+    started = time.monotonic()
+    last_lines, code = utils.stream_command(command, cwd=sub_path, env=utils.NO_PROMPT_ENV, on_line=on_line, progress_interval=0.5)
+    return status["path"], code == 0, time.monotonic() - started, None if code == 0 else (last_lines[-1] if last_lines else f"exit code {code}")
+
+def push_dirty_submodules(repo_path, statuses, on_progress=None):
+    """
+    Pushes the submodules in `statuses` that have unpushed commits, deepest first so nested
+    submodules land before the submodules that record them; each depth level is pushed
+    concurrently. Returns a list of (path, ok, seconds, error), stopping after a failing level.
+    """
+    paths = [s["path"] for s in statuses]
+    levels = {}
+    for status in statuses:
+        if not status["initialized"] or status["unpushed"] <= 0: continue
+        depth = sum(1 for other in paths if status["path"].startswith(other + "/"))
+        levels.setdefault(depth, []).append(status)
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, config.SUBMODULE_JOBS)) as pool:
+        for depth in sorted(levels, reverse=True):
+            level_results = list(pool.map(lambda s: _push_submodule(repo_path, s, on_progress), levels[depth]))
+            results.extend(level_results)
+            if not all(ok for _, ok, _, _ in level_results): break
+    return results
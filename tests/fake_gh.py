@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the GitHub CLI used by the tests. Repositories are bare repos under
+$FAKE_GH_ROOT/<owner>/<name>.git; every invocation is appended to $FAKE_GH_LOG.
+Names listed in $FAKE_GH_FAIL (comma separated) fail to clone or resolve.
+"""
+import os
+import re
+import sys
+import json
+import subprocess
+
+def _repositories(root):
+    names = []
+    for owner in sorted(os.listdir(root)):
+        for entry in sorted(os.listdir(os.path.join(root, owner))):
+            if entry.endswith(".git"): names.append(f"{owner}/{entry[:-4]}")
+    return names
+
+def main(args):
+    root = os.environ["FAKE_GH_ROOT"]
+    failing = set(filter(None, os.environ.get("FAKE_GH_FAIL", "").split(",")))
+    if os.environ.get("FAKE_GH_LOG"):
+        with open(os.environ["FAKE_GH_LOG"], "a", encoding="utf-8") as f:
+            f.write(json.dumps(args) + "\n")
+
+    if args[:2] == ["auth", "status"]: return 0
+    if args[:2] == ["repo", "list"]:
+        print(json.dumps([{"nameWithOwner": name, "name": name.split("/")[1], "visibility": "PUBLIC",
+                           "description": "", "updatedAt": "2026-01-01T00:00:00Z"} for name in _repositories(root)]))
+        return 0
+    if args[:2] == ["repo", "clone"]:
+        name, target, extra = args[2], args[3], args[5:] if args[4:5] == ["--"] else []
+        if name in failing:
+            print(f"GraphQL: Could not resolve to a Repository with the name '{name}'.", file=sys.stderr); return 1
+        return subprocess.run(["git", "clone", "-q"] + extra + [os.path.join(root, f"{name}.git"), target]).returncode
+    if args[:2] == ["api", "graphql"]:
+        fields = dict(arg.split("=", 1) for arg in args[3::2])
+        data, errors = {}, []
+        for alias, index in re.findall(r"(r(\d+)): repository\(", fields["query"]):
+            name = f"{fields['o' + index]}/{fields['n' + index]}"
+            if name in failing or not os.path.isdir(os.path.join(root, f"{name}.git")):
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias], "message": f"Could not resolve to a Repository with the name '{name}'."})
+                continue
+            data[alias] = {"nameWithOwner": name, "isArchived": False, "diskUsage": 1,
+                           "defaultBranchRef": {"name": "main"}, "primaryLanguage": {"name": "Python"},
+                           "pullRequests": {"totalCount": 0}, "issues": {"totalCount": 0}}
+        print(json.dumps({"data": data, **({"errors": errors} if errors else {})}))
+        if errors:
+            print(f"gh: {errors[0]['message']}", file=sys.stderr); return 1
+        return 0
+    print(f"fake gh: unsupported command {args}", file=sys.stderr)
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path: sys.path.insert(0, REPO_ROOT)
+
+import config
+
+FAKE_GH = os.path.join(REPO_ROOT, "tests", "fake_gh.py")
+GIT_ENV = {"GIT_AUTHOR_NAME": "EasyGit Tests", "GIT_AUTHOR_EMAIL": "tests@example.com",
+           "GIT_COMMITTER_NAME": "EasyGit Tests", "GIT_COMMITTER_EMAIL": "tests@example.com"}
+
+def git(*args, cwd=None):
+    return subprocess.run(["git"] + list(args), cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+class FakeGhTestCase(unittest.TestCase):
+    """Points config.GH_COMMAND at tests/fake_gh.py and config.EASYGIT_HOME at a scratch directory."""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="easygit-tests-")
+        self.server = os.path.join(self.tmp, "server")
+        self.gh_log = os.path.join(self.tmp, "gh-calls.log")
+        os.makedirs(self.server)
+        self._saved_env = dict(os.environ)
+        os.environ.update(GIT_ENV, FAKE_GH_ROOT=self.server, FAKE_GH_LOG=self.gh_log)
+        os.environ.pop("FAKE_GH_FAIL", None)
+        self._saved_config = (config.GH_COMMAND, config.EASYGIT_HOME)
+        config.GH_COMMAND, config.EASYGIT_HOME = FAKE_GH, os.path.join(self.tmp, "home")
+
+    def tearDown(self):
+        config.GH_COMMAND, config.EASYGIT_HOME = self._saved_config
+        os.environ.clear(); os.environ.update(self._saved_env)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def make_remote(self, name_with_owner, files=1):
+        """Creates a bare repository on the fake server with `files` commits; returns its path."""
+        bare = os.path.join(self.server, f"{name_with_owner}.git")
+        git("init", "-q", "--bare", bare)
+        work = os.path.join(self.tmp, "work", name_with_owner)
+        git("clone", "-q", bare, work)
+        for n in range(files): self.commit_file(work, f"file{n}.txt", f"{n}\n")
+        return bare
+
+    def commit_file(self, work, name, content):
+        with open(os.path.join(work, name), "w", encoding="utf-8") as f: f.write(content)
+        git("add", name, cwd=work); git("commit", "-q", "-m", f"Update {name}", cwd=work)
+        git("push", "-q", "origin", "HEAD", cwd=work)
+        return git("rev-parse", "HEAD", cwd=work)
+
+    def gh_calls(self, *prefix):
+        import json
+        if not os.path.exists(self.gh_log): return []
+        with open(self.gh_log, encoding="utf-8") as f:
+            calls = [json.loads(line) for line in f]
+        return [c for c in calls if c[:len(prefix)] == list(prefix)]
@@ -0,0 +1,51 @@
+import os
+import unittest
+from support import FakeGhTestCase, git
+import mirror_sync
+
+class MirrorSyncTests(FakeGhTestCase):
+    def setUp(self):
+        super().setUp()
+        self.make_remote("me/alpha"); self.make_remote("me/beta", files=2)
+        self.root = os.path.join(self.tmp, "mirrors")
+
+    def test_clones_then_fetches_bare_mirrors(self):
+        results, _ = mirror_sync.sync_mirrors(["me/alpha", "me/beta"], self.root, mode="bare", workers=2)
+        self.assertEqual({(r["repo"], r["action"], r["ok"]) for r in results}, {("me/alpha", "clone", True), ("me/beta", "clone", True)})
+        alpha = mirror_sync.mirror_path(self.root, "me/alpha", "bare")
+        self.assertEqual(git("rev-parse", "--is-bare-repository", cwd=alpha), "true")
+
+        new_head = self.commit_file(os.path.join(self.tmp, "work", "me", "alpha"), "later.txt", "later\n")
+        results, _ = mirror_sync.sync_mirrors(["me/alpha", "me/beta"], self.root, mode="bare", workers=2)
+        self.assertTrue(all(r["ok"] and r["action"] == "fetch" for r in results))
+        self.assertEqual(git("rev-parse", "HEAD", cwd=alpha), new_head)
+        self.assertEqual(len(self.gh_calls("repo", "clone")), 2) # Second run fetched without gh
+        self.assertEqual(mirror_sync.pending_from_previous_run(self.root, "bare"), [])
+
+    def test_failed_repositories_stay_pending_and_resume(self):
+        os.environ["FAKE_GH_FAIL"] = "me/beta"
+        results, _ = mirror_sync.sync_mirrors(["me/alpha", "me/beta"], self.root, mode="worktree")
+        self.assertEqual({r["repo"]: r["ok"] for r in results}, {"me/alpha": True, "me/beta": False})
+        self.assertFalse(os.path.exists(mirror_sync.mirror_path(self.root, "me/beta", "worktree") + ".partial"))
+        self.assertEqual(mirror_sync.pending_from_previous_run(self.root, "worktree"), ["me/beta"])
+        self.assertEqual(mirror_sync.pending_from_previous_run(self.root, "bare"), []) # Other mode is not resumed
+
+        del os.environ["FAKE_GH_FAIL"]
+        results, _ = mirror_sync.sync_mirrors(mirror_sync.pending_from_previous_run(self.root, "worktree"), self.root, mode="worktree")
+        self.assertEqual([(r["repo"], r["action"], r["ok"]) for r in results], [("me/beta", "clone", True)])
+        self.assertEqual(mirror_sync.pending_from_previous_run(self.root, "worktree"), [])
+
+    def test_existing_non_repository_target_fails_only_that_repository(self):
+        stray = mirror_sync.mirror_path(self.root, "me/beta", "bare")
+        os.makedirs(stray)
+        with open(os.path.join(stray, "notes.txt"), "w") as f: f.write("not a mirror")
+        results, _ = mirror_sync.sync_mirrors(["me/alpha", "me/beta"], self.root, mode="bare")
+        by_repo = {r["repo"]: r for r in results}
+        self.assertTrue(by_repo["me/alpha"]["ok"])
+        self.assertFalse(by_repo["me/beta"]["ok"])
+        self.assertIn("already exists", by_repo["me/beta"]["error"])
+        self.assertTrue(os.path.exists(os.path.join(stray, "notes.txt")))
+        self.assertEqual(mirror_sync.pending_from_previous_run(self.root, "bare"), ["me/beta"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import os
+import unittest
+from support import FakeGhTestCase
+import config
+import repo_metadata
+
+class RepoMetadataTests(FakeGhTestCase):
+    def test_sixty_repositories_take_three_graphql_calls(self):
+        names = [f"me/repo{i:02d}" for i in range(60)]
+        for name in names:
+            if name != "me/repo07": os.makedirs(os.path.join(self.server, f"{name}.git"))
+        self.assertEqual(config.REMOTE_METADATA_BATCH_SIZE, 25)
+
+        metadata, errors = repo_metadata.fetch_metadata(names)
+
+        self.assertEqual(len(self.gh_calls("api", "graphql")), 3)
+        self.assertEqual(set(metadata), set(names) - {"me/repo07"}) # The rest of its batch still resolved
+        self.assertEqual(len(errors), 1)
+        self.assertIn("me/repo07", errors[0])
+        self.assertEqual(metadata["me/repo59"], {"defaultBranch": "main", "diskUsage": 1, "primaryLanguage": "Python",
+                                                 "openPullRequests": 0, "openIssues": 0, "isArchived": False})
+
+    def test_query_passes_names_as_variables(self):
+        query, variables = repo_metadata.build_query(['me/a"b', "other/c"])
+        self.assertNotIn('a"b', query)
+        self.assertEqual(variables, {"o0": "me", "n0": 'a"b', "o1": "other", "n1": "c"})
+        self.assertIn("r1: repository(owner: $o1, name: $n1)", query)
+
+if __name__ == "__main__":
+    unittest.main()
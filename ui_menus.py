@@ -4,6 +4,8 @@ import shutil
 from InquirerPy import inquirer
 from InquirerPy.base.control import Choice
 import git_actions
+import background_fetch
+import daemon_client
 import state
 import utils
 import config
@@ -43,6 +45,7 @@ def display_manage_remote_menu():
             ("rename_remote", "✏️ Rename Remote Repository"),
             ("edit_desc_remote", "📜 Edit Remote Repository Description"),
             ("delete_remote", "🗑️ Delete Remote Repository"),
+            ("sync_mirrors", "🪞 Sync Local Mirrors of All Repositories"),
             ("back", "🔙 Back to Main Menu"),
         ]
         action = inquirer.select(
@@ -55,6 +58,7 @@ def display_manage_remote_menu():
         elif action == "rename_remote": git_actions.rename_remote_repository()
         elif action == "edit_desc_remote": git_actions.edit_remote_repository_description()
         elif action == "delete_remote": git_actions.delete_remote_repository()
+        elif action == "sync_mirrors": git_actions.sync_remote_mirrors()
         elif action == "back": break
         else: print("Invalid choice.")
         if action != "back": inquirer.text(message="Press Enter to continue...").execute()
@@ -73,10 +77,14 @@ def display_local_repo_menu():
             if not git_actions.set_current_repository():
                 inquirer.text(message="Press Enter to return to main menu...").execute(); return
             utils.clear_screen(); repo_name = os.path.basename(state.current_repo_path) if state.current_repo_path else "N/A"
-        message_prompt = _get_formatted_message(f"Local Repo ({repo_name}): What would you like to do?")
+        counts = daemon_client.try_call("ahead_behind", repo=state.current_repo_path)
+        remote_summary = f"↑{counts['ahead']} ↓{counts['behind']}" if counts else background_fetch.remote_status_summary(state.current_repo_path)
+        message_prompt = _get_formatted_message(f"Local Repo ({repo_name}) [{remote_summary}]: What would you like to do?")
         choices_definition = [
             ("status", "📊 View Status"), ("modify", "📝 Modify/Create File"), ("stage", "➕ Stage Changes"),
-            ("commit", "✉️ Commit Changes"), ("push", "⬆️ Push Changes"), ("pull", "⬇️ Pull Changes"),
+            ("review", "🔍 Review Staged Changes"), ("commit", "✉️ Commit Changes"), ("push", "⬆️ Push Changes"),
+            ("pull", "⬇️ Pull Changes"), ("branches", "🌿 Branches (Worktrees)"), ("log", "📜 Browse Commit History"),
+            ("stats", "📈 Repository Statistics"), ("optimize", "🧹 Optimize Repository"),
             ("change_repo", "🔄 Change Current Repository"), ("back", "🔙 Back to Main Menu"),
         ]
         action = inquirer.select(
@@ -87,9 +95,14 @@ def display_local_repo_menu():
         if action == "status": git_actions.view_status()
         elif action == "modify": git_actions.modify_file()
         elif action == "stage": git_actions.stage_changes()
+        elif action == "review": git_actions.review_staged_changes()
         elif action == "commit": git_actions.commit_changes()
         elif action == "push": git_actions.push_changes()
         elif action == "pull": git_actions.pull_changes()
+        elif action == "branches": git_actions.manage_branches()
+        elif action == "log": git_actions.browse_commit_log()
+        elif action == "stats": git_actions.view_repository_stats()
+        elif action == "optimize": git_actions.optimize_repository()
         elif action == "change_repo": git_actions.set_current_repository(); continue
         elif action == "back": break
         else: print("Invalid choice.")
@@ -107,6 +120,7 @@ def display_main_menu():
         choices_definition = [
             ("auth_github", "🔑 Authenticate GitHub Account"),
             ("create_new_empty_remote", "☁️ Create New Empty GitHub Repo (and clone)"),
+            ("clone_existing_remote", "📥 Clone Existing GitHub Repo"),
             ("push_existing_project", "🚀 Push Existing Local Project to New GitHub Repo"),
             ("work_local", "💻 Work with Existing Local Repository"),
             ("manage_remote", "🛠️ Manage Remote GitHub Repositories"),
@@ -126,6 +140,7 @@ def display_main_menu():
 
         if action == "auth_github": git_actions.authenticate_github_account()
         elif action == "create_new_empty_remote": git_actions.create_github_repository()
+        elif action == "clone_existing_remote": git_actions.clone_github_repository()
         elif action == "push_existing_project":
             git_actions.push_existing_project_to_new_repo()
         elif action == "work_local":
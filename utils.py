@@ -1,9 +1,18 @@
 import os
+import json
 import subprocess
 import platform
 import shutil
+import shlex
+import time
 import config
 
+# Environment for git commands that run unattended (background or in parallel): they must
+# fail instead of stopping to ask for credentials while a menu or other output is on screen.
+NO_PROMPT_ENV = {"GIT_TERMINAL_PROMPT": "0"}
+if "GIT_SSH_COMMAND" not in os.environ:
+    NO_PROMPT_ENV["GIT_SSH_COMMAND"] = "ssh -o BatchMode=yes"
+
 def run_command(command_list, cwd=None, capture_output=False, text=True, check=False, env=None):
     """Runs a shell command."""
     effective_env = os.environ.copy()
@@ -42,13 +51,81 @@ def run_command(command_list, cwd=None, capture_output=False, text=True, check=F
         return None, str(e_gen), -1
 
 
+def stream_command(command_list, cwd=None, env=None, on_line=None, progress_interval=None):
+    """
+    Runs a command and hands each line of its combined stdout/stderr to `on_line`
+    as soon as it arrives. Carriage-return progress updates (as printed by git)
+    are passed with is_progress=True, at most one per `progress_interval` seconds
+    if given. Returns (last_lines, returncode).
+    """
+    effective_env = os.environ.copy()
+    if env:
+        effective_env.update(env)
+    last_lines = []
+    try:
+        process = subprocess.Popen(
+            command_list, cwd=cwd, env=effective_env,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+    except FileNotFoundError:
+        return [f"Command not found: {command_list[0]}"], 1
+    pending = b""
+    last_progress = 0.0
+    for chunk in iter(lambda: process.stdout.read1(4096), b""):
+        pending += chunk
+        while True:
+            cut = min((i for i in (pending.find(b"\r"), pending.find(b"\n")) if i != -1), default=-1)
+            if cut == -1: break
+            segment, is_progress = pending[:cut], pending[cut:cut + 1] == b"\r"
+            pending = pending[cut + 1:]
+            line = segment.decode('utf-8', errors='replace').rstrip()
+            if not line: continue
+            if not is_progress:
+                last_lines = (last_lines + [line])[-5:]
+            elif progress_interval:
+                now = time.monotonic()
+                if now - last_progress < progress_interval: continue
+                last_progress = now
+            if on_line: on_line(line, is_progress)
+    if pending.strip():
+        line = pending.decode('utf-8', errors='replace').rstrip()
+        last_lines = (last_lines + [line])[-5:]
+        if on_line: on_line(line, False)
+    process.stdout.close()
+    return last_lines, process.wait()
+
+
+def iter_nul_records(stream, chunk_size=65536):
+    """Lazily yields NUL-terminated records (decoded) from a binary stream such as a git -z pipe."""
+    pending = b""
+    for chunk in iter(lambda: stream.read1(chunk_size), b""):
+        pending += chunk
+        *records, pending = pending.split(b"\0")
+        for record in records:
+            yield record.decode('utf-8', errors='replace')
+    if pending:
+        yield pending.decode('utf-8', errors='replace')
+
 def is_git_repository(path="."):
-    """Checks if the given path is a Git repository."""
-    return os.path.isdir(os.path.join(path, ".git"))
+    """Checks if the given path is a Git repository (linked worktrees and submodules have a '.git' file)."""
+    git_path = os.path.join(path, ".git")
+    return os.path.isdir(git_path) or os.path.isfile(git_path)
+
+def has_submodules(path="."):
+    """Checks if the repository at path declares submodules in a .gitmodules file."""
+    return os.path.isfile(os.path.join(path, ".gitmodules"))
 
-def select_editor_and_edit(filepath):
-    """Opens the given file in the configured system editor."""
-    editor_command = [config.DEFAULT_EDITOR, filepath]
+def _editor_command(filepath, line=None):
+    editor_name = os.path.splitext(os.path.basename(config.DEFAULT_EDITOR))[0].lower()
+    if line and editor_name in ("vi", "vim", "nvim", "nano", "emacs", "micro", "kak", "joe", "mcedit"):
+        return [config.DEFAULT_EDITOR, f"+{line}", filepath]
+    if line and editor_name in ("code", "codium", "subl", "atom"):
+        return [config.DEFAULT_EDITOR, "-g", f"{filepath}:{line}"]
+    return [config.DEFAULT_EDITOR, filepath]
+
+def select_editor_and_edit(filepath, line=None):
+    """Opens the given file in the configured system editor, at `line` if the editor supports it."""
+    editor_command = _editor_command(filepath, line)
     print(f"📝 Opening {filepath} with {config.DEFAULT_EDITOR}...")
     try:
         return_code = subprocess.call(editor_command)
@@ -71,6 +148,10 @@ def check_git_installed():
     print("✅ Git is installed.")
     return True
 
+def gh_repo_list_command():
+    """`gh repo list` invocation shared by the menus and the daemon, so both list the same fields."""
+    return [config.GH_COMMAND, "repo", "list", "--json", "nameWithOwner,name,visibility,updatedAt,description", "--limit", "100"]
+
 def ensure_gh_installed_and_authed():
     """Checks if GitHub CLI is installed and auth status."""
     print("🔎 Checking GitHub CLI ('gh') installation and authentication...")
@@ -129,6 +210,63 @@ def print_formatted_menu(text_lines, title=""):
     formatted_lines = format_menu_text(text_lines, title)
     for line in formatted_lines:
         print(line)
+
+def _builtin_page(stream):
+    """Minimal pager for when no external pager is available. Returns False if the user quit early."""
+    page_size = max(5, shutil.get_terminal_size((80, 24)).lines - 2)
+    shown = 0
+    for raw_line in stream:
+        print(raw_line.decode('utf-8', errors='replace'), end='')
+        shown += 1
+        if shown % page_size == 0:
+            if input("-- More -- (Enter for next page, q to quit) ").strip().lower() == 'q':
+                return False
+    return True
+
+def page_command_output(command_list, cwd=None):
+    """
+    Streams a command's stdout straight into the configured pager, so output is
+    shown as soon as it is produced and never collected in memory.
+    """
+    pager = shlex.split(config.PAGER_COMMAND) if config.PAGER_COMMAND else []
+    try:
+        producer = subprocess.Popen(command_list, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        print(f"❌ Error: Command '{command_list[0]}' not found. Is it installed and in PATH?")
+        return 1
+    try:
+        if pager and shutil.which(pager[0]):
+            subprocess.run(pager, stdin=producer.stdout)
+        else:
+            _builtin_page(producer.stdout)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        producer.stdout.close()
+        if producer.poll() is None:
+            producer.terminate()
+    return producer.wait()
+
+def page_lines(lines):
+    """Feeds an iterable of text lines (without newlines) into the configured pager."""
+    pager = shlex.split(config.PAGER_COMMAND) if config.PAGER_COMMAND else []
+    encoded = (f"{line}\n".encode('utf-8', errors='replace') for line in lines)
+    try:
+        if pager and shutil.which(pager[0]):
+            viewer = subprocess.Popen(pager, stdin=subprocess.PIPE)
+            try:
+                for chunk in encoded: viewer.stdin.write(chunk)
+            except BrokenPipeError:
+                pass # User quit the pager early
+            finally:
+                try: viewer.stdin.close()
+                except BrokenPipeError: pass
+            viewer.wait()
+        else:
+            _builtin_page(encoded)
+    except KeyboardInterrupt:
+        pass
+
 def view_file_content_in_terminal(filepath, max_lines=50):
     """
     Prints the content of a file to the terminal.
@@ -150,4 +288,42 @@ def view_file_content_in_terminal(filepath, max_lines=50):
         print(f"❌ Error: File '{filepath}' not found.")
     except Exception as e:
         print(f"❌ Error reading file '{filepath}': {e}")
-    print("\n" + "-" * 40)
\ No newline at end of file
+    print("\n" + "-" * 40)
+
+def _cache_file_path(name):
+    return os.path.join(config.EASYGIT_HOME, f"{name}.json")
+
+def load_json_cache(name, default=None):
+    """Loads a JSON cache file from config.EASYGIT_HOME, returning default if missing or unreadable."""
+    try:
+        with open(_cache_file_path(name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+def save_json_cache(name, data):
+    """Atomically writes a JSON cache file into config.EASYGIT_HOME."""
+    path = _cache_file_path(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(config.EASYGIT_HOME, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"⚠️ Could not write cache '{path}': {e}")
+        return False
+
+KNOWN_REPOS_CACHE = "known_repos"
+
+def remember_repository(path):
+    """Records a local repository EasyGit has worked with, for actions that span all known repos."""
+    known = load_json_cache(KNOWN_REPOS_CACHE, default=[])
+    if path in known: return
+    known.append(path)
+    save_json_cache(KNOWN_REPOS_CACHE, known)
+
+def known_repositories():
+    """Returns remembered local repositories that still exist and are Git repositories."""
+    return [p for p in load_json_cache(KNOWN_REPOS_CACHE, default=[]) if is_git_repository(p)]
@@ -0,0 +1,101 @@
+import os
+import re
+import time
+import utils
+import config
+
+WORKTREE_CACHE_NAME = "worktrees"
+_REF_FORMAT = "%(refname)%00%(refname:short)%00%(objectname:short)%00%(committerdate:relative)%00%(upstream:short)%00%(worktreepath)%00%(subject)"
+
+def list_branches(repo_path):
+    """
+    Lists local and remote-tracking branches in one `git for-each-ref` call.
+    Each dict has name, remote, commit, date, upstream, worktree and subject.
+    """
+    stdout, _, code = utils.run_command(
+        ["git", "for-each-ref", "--sort=-committerdate", f"--format={_REF_FORMAT}", "refs/heads", "refs/remotes"],
+        cwd=repo_path, capture_output=True
+    )
+    branches = []
+    if code != 0 or not stdout: return branches
+    for line in stdout.splitlines():
+        fields = line.split("\0")
+        if len(fields) != 7 or fields[0].endswith("/HEAD"): continue
+        refname, name, commit, date, upstream, worktree, subject = fields
+        branches.append({"name": name, "remote": refname.startswith("refs/remotes/"), "commit": commit, "date": date,
+                         "upstream": upstream, "worktree": worktree or None, "subject": subject})
+    return branches
+
+def main_worktree(repo_path):
+    """Returns the path of the main checkout, even when repo_path is a linked worktree."""
+    stdout, _, code = utils.run_command(["git", "worktree", "list", "--porcelain"], cwd=repo_path, capture_output=True)
+    if code == 0 and stdout.startswith("worktree "):
+        return stdout.splitlines()[0][len("worktree "):]
+    return repo_path
+
+def _managed_root(main_path):
+    if config.WORKTREE_ROOT:
+        return os.path.join(os.path.expanduser(config.WORKTREE_ROOT), os.path.basename(main_path))
+    return f"{main_path}.worktrees"
+
+def _touch(main_path, branch, path):
+    cache = utils.load_json_cache(WORKTREE_CACHE_NAME)
+    cache.setdefault(main_path, {})[branch] = {"path": path, "last_used": time.time()}
+    utils.save_json_cache(WORKTREE_CACHE_NAME, cache)
+
+def open_branch(repo_path, branch, is_remote=False):
+    """
+    Returns (path, error) of a worktree with `branch` checked out. Existing worktrees
+    (including the main checkout) are reused as-is; otherwise a managed worktree is
+    added, creating a local tracking branch for remote branches.
+    """
+    main_path = main_worktree(repo_path)
+    local_name = branch.split("/", 1)[1] if is_remote else branch
+    for candidate in list_branches(main_path):
+        if not candidate["remote"] and candidate["name"] == local_name and candidate["worktree"]:
+            _touch(main_path, local_name, candidate["worktree"])
+            return candidate["worktree"], None
+    local_exists = any(not b["remote"] and b["name"] == local_name for b in list_branches(main_path))
+    path = os.path.join(_managed_root(main_path), re.sub(r"[^A-Za-z0-9._-]+", "-", local_name))
+    if is_remote and not local_exists:
+        command = ["git", "worktree", "add", "--track", "-b", local_name, path, branch]
+    else:
+        command = ["git", "worktree", "add", path, local_name]
+    _, stderr, code = utils.run_command(command, cwd=main_path, capture_output=True)
+    if code != 0: return None, stderr
+    _touch(main_path, local_name, path)
+    return path, None
+
+def create_branch(repo_path, new_branch, start_point="HEAD"):
+    """Creates `new_branch` from start_point directly in a new managed worktree. Returns (path, error)."""
+    main_path = main_worktree(repo_path)
+    path = os.path.join(_managed_root(main_path), re.sub(r"[^A-Za-z0-9._-]+", "-", new_branch))
+    _, stderr, code = utils.run_command(["git", "worktree", "add", "-b", new_branch, path, start_point], cwd=repo_path, capture_output=True)
+    if code != 0: return None, stderr
+    _touch(main_path, new_branch, path)
+    return path, None
+
+def prune_idle(repo_path, keep_path=None):
+    """
+    Removes managed worktrees unused for config.WORKTREE_IDLE_DAYS that have no
+    uncommitted changes, then prunes stale worktree metadata. Returns removed paths.
+    """
+    main_path = main_worktree(repo_path)
+    cache = utils.load_json_cache(WORKTREE_CACHE_NAME)
+    managed = cache.get(main_path, {})
+    cutoff = time.time() - config.WORKTREE_IDLE_DAYS * 86400
+    removed = []
+    for branch, info in list(managed.items()):
+        path = info["path"]
+        if path in (main_path, keep_path) or not path.startswith(_managed_root(main_path)): continue
+        if not os.path.isdir(path):
+            managed.pop(branch); continue
+        if info["last_used"] > cutoff: continue
+        dirty, _, code = utils.run_command(["git", "status", "--porcelain"], cwd=path, capture_output=True)
+        if code != 0 or dirty: continue
+        _, _, code = utils.run_command(["git", "worktree", "remove", path], cwd=main_path, capture_output=True)
+        if code == 0:
+            managed.pop(branch); removed.append(path)
+    utils.run_command(["git", "worktree", "prune"], cwd=main_path, capture_output=True)
+    utils.save_json_cache(WORKTREE_CACHE_NAME, cache)
+    return removed